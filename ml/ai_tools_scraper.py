@@ -1,51 +1,76 @@
-import requests
-from bs4 import BeautifulSoup
-import random
-import json
-
-# ----------------------------
-# User-Agent rotation
-# ----------------------------
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
-    "Mozilla/5.0 (X11; Linux x86_64) Gecko/20100101 Firefox/122.0"
-]
+from bs4 import SoupStrainer
+import os
+from functools import partial
+
+import dedup
+import fanout
+import http_client
+import metrics
+import records
+import singleflight
+from records import AITool
+from cache import cached_scrape
+from html_parser import make_soup
+
+# Overall budget for querying Aixploria and DuckDuckGo together in search_ai_tools
+AI_TOOLS_SEARCH_DEADLINE = float(os.getenv("AI_TOOLS_SEARCH_DEADLINE", 20))
 
 # ----------------------------
 # Primary Aixploria Scraper
 # ----------------------------
-def scrape_ai_tools_real_time(query="AI tools", limit=5):
+@metrics.timed_stage("html_parse")
+def parse_aixploria_tools(html, limit=5):
+    """Extract ``AITool`` records from an Aixploria search page.
+
+    Tool cards are matched by content (a div holding ``.post-info``) rather
+    than by a wrapper class, so the whole page is parsed without a strainer.
+    The divs wrapping a card match too; they yield the same tool and are skipped.
+    """
     tools = []
-    base_url = "https://www.aixploria.com"
-    search_url = f"{base_url}/en/?s={query.replace(' ', '+')}"
+    seen = set()
+    soup = make_soup(html)
+    articles = soup.find_all(lambda tag: tag.name == 'div' and tag.find(class_='post-info'))
+    for art in articles:
+        if len(tools) >= limit:
+            break
+        title_tag = art.find(class_="dark-title")
+        url_tag = art.find("a", class_="visit-site-button4")
+        desc_tag = art.find("p", class_="post-excerpt")
+
+        if not title_tag or not url_tag:
+            continue
+
+        title = title_tag.get_text(strip=True)
+        url = url_tag["href"]
+        description = desc_tag.get_text(strip=True) if desc_tag else f"AI tool: {title}"
+        if (title, url) not in seen:
+            seen.add((title, url))
+            tools.append(AITool(title=title, url=url, description=description))
+
+    return tools
 
-    try:
-        headers = {"User-Agent": random.choice(USER_AGENTS)}
-        resp = requests.get(search_url, headers=headers, timeout=20)
-        resp.raise_for_status()
-
-        soup = BeautifulSoup(resp.text, "html.parser")
-        articles = soup.find_all(lambda tag: tag.name == 'div' and tag.find(class_='post-info'), limit=limit)
-        i=0
-        for art in articles:
-            title_tag = art.find(class_="dark-title")
-            url_tag = art.find("a", class_="visit-site-button4")
-            desc_tag = art.find("p", class_="post-excerpt")
-
-            if not title_tag or not url_tag:
-                continue
-
-            title = title_tag.get_text(strip=True)
-            url = url_tag["href"]
-            description = desc_tag.get_text(strip=True) if desc_tag else f"AI tool: {title}"
-            if title not in tools:
-                i=i+1
-                tools.append({"title": title, "url": url, "description": description})
 
+def aixploria_search_url(query):
+    return f"https://www.aixploria.com/en/?s={query.replace(' ', '+')}"
+
+
+@cached_scrape("aixploria")
+def scrape_aixploria_tools(query="AI tools", limit=5):
+    """Scrape Aixploria search results. Raises on network/HTTP errors."""
+    search_url = aixploria_search_url(query)
+
+    resp = http_client.fetch(search_url, timeout=20)
+    resp.raise_for_status()
+    return parse_aixploria_tools(resp.text, limit)
+
+
+@singleflight.coalesce("ai_tools")
+def scrape_ai_tools_real_time(query="AI tools", limit=5):
+    try:
+        tools = scrape_aixploria_tools(query, limit)
         if tools:
             print(f"✅ Found {len(tools)} tools on Aixploria for '{query}'")
-            return tools
+            return merge_tools([(0, tools)], limit, query)
 
         # If no results, fallback
         return scrape_ai_tools_fallback(query, limit)
@@ -57,25 +82,44 @@ def scrape_ai_tools_real_time(query="AI tools", limit=5):
 # ----------------------------
 # DuckDuckGo Fallback Scraper
 # ----------------------------
-def scrape_ai_tools_fallback(query="AI tools", limit=10):
+DUCKDUCKGO_STRAINER = SoupStrainer("a", class_="result__a")
+
+
+@metrics.timed_stage("html_parse")
+def parse_duckduckgo_tools(html, limit=10):
+    """Extract ``AITool`` records from a DuckDuckGo HTML results page."""
     tools = []
-    try:
-        search_url = f"https://duckduckgo.com/html/?q=site:aixploria.com+{query}"
-        headers = {"User-Agent": random.choice(USER_AGENTS)}
-        resp = requests.get(search_url, headers=headers, timeout=15)
-        resp.raise_for_status()
+    soup = make_soup(html, DUCKDUCKGO_STRAINER)
+    results = soup.select("a.result__a")
+
+    for r in results[:limit]:
+        title = r.get_text(strip=True)
+        url = r["href"]
+        tools.append(AITool(title=title, url=url, description=f"AI tool from Aixploria: {title}"))
+
+    return tools
+
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        results = soup.select("a.result__a")
+def duckduckgo_search_url(query):
+    return f"https://duckduckgo.com/html/?q=site:aixploria.com+{query}"
 
-        for r in results[:limit]:
-            title = r.get_text(strip=True)
-            url = r["href"]
-            tools.append({"title": title, "url": url, "description": f"AI tool from Aixploria: {title}"})
 
+@cached_scrape("duckduckgo")
+def scrape_duckduckgo_tools(query="AI tools", limit=10):
+    """Find Aixploria tool pages through DuckDuckGo. Raises on network/HTTP errors."""
+    search_url = duckduckgo_search_url(query)
+    resp = http_client.fetch(search_url, timeout=15)
+    resp.raise_for_status()
+    return parse_duckduckgo_tools(resp.text, limit)
+
+
+def scrape_ai_tools_fallback(query="AI tools", limit=10):
+    metrics.fallbacks.inc("scrape_ai_tools_fallback")
+    try:
+        tools = scrape_duckduckgo_tools(query, limit)
         if tools:
             print(f"🔄 DuckDuckGo fallback: {len(tools)} tools found")
-            return tools
+            return merge_tools([(0, tools)], limit, query)
 
         return generate_mock_ai_tools(query, limit)
 
@@ -83,16 +127,44 @@ def scrape_ai_tools_fallback(query="AI tools", limit=10):
         print(f"⚠️ Fallback error: {e}")
         return generate_mock_ai_tools(query, limit)
 
+# ----------------------------
+# Concurrent search
+# ----------------------------
+@singleflight.coalesce("ai_tools_search")
+def search_ai_tools(query="AI tools", limit=5):
+    """Query Aixploria and DuckDuckGo at the same time and merge their tools.
+
+    Takes as long as the slower source (at most AI_TOOLS_SEARCH_DEADLINE), not
+    both in turn like scrape_ai_tools_real_time when Aixploria fails. Mock
+    tools are returned only when neither source has any.
+    """
+    results = fanout.as_completed([
+        partial(scrape_aixploria_tools, query, limit),
+        partial(scrape_duckduckgo_tools, query, limit),
+    ], AI_TOOLS_SEARCH_DEADLINE)
+    tools = merge_tools(results, limit, query)
+    if tools:
+        print(f"✅ Found {len(tools)} tools on Aixploria/DuckDuckGo for '{query}'")
+        return tools
+    return generate_mock_ai_tools(query, limit)
+
+
+def merge_tools(results, limit, query=""):
+    """Merge ``(source index, tools)`` pairs into the ``limit`` tools most relevant
+    to ``query``, dropping tools seen under the same URL or a near-identical title."""
+    return dedup.merge("ai_tools", results, limit, query)
+
 # ----------------------------
 def generate_mock_ai_tools(query="AI tools", limit=10):
+    metrics.fallbacks.inc("generate_mock_ai_tools")
     mock_tools = [
-        {"title": "ChatGPT", "url": "https://chat.openai.com/", "description": "OpenAI's conversational AI assistant."},
-        {"title": "Claude", "url": "https://claude.ai/", "description": "Anthropic's helpful AI assistant."},
-        {"title": "Midjourney", "url": "https://www.midjourney.com/", "description": "AI-powered image generation platform."},
-        {"title": "DALL·E", "url": "https://openai.com/dall-e-2/", "description": "OpenAI's AI image generator."},
-        {"title": "Notion AI", "url": "https://www.notion.so/product/ai", "description": "AI-powered productivity and writing assistant."},
-        {"title": "Jasper", "url": "https://www.jasper.ai/", "description": "AI content and marketing platform."},
-        {"title": "Copy.ai", "url": "https://www.copy.ai/", "description": "AI-powered content and copywriting tool."},
+        AITool("ChatGPT", "https://chat.openai.com/", "OpenAI's conversational AI assistant."),
+        AITool("Claude", "https://claude.ai/", "Anthropic's helpful AI assistant."),
+        AITool("Midjourney", "https://www.midjourney.com/", "AI-powered image generation platform."),
+        AITool("DALL·E", "https://openai.com/dall-e-2/", "OpenAI's AI image generator."),
+        AITool("Notion AI", "https://www.notion.so/product/ai", "AI-powered productivity and writing assistant."),
+        AITool("Jasper", "https://www.jasper.ai/", "AI content and marketing platform."),
+        AITool("Copy.ai", "https://www.copy.ai/", "AI-powered content and copywriting tool."),
     ]
     print("ℹ️ Using mock AI tools as last resort")
     return mock_tools[:limit]
@@ -100,21 +172,30 @@ def generate_mock_ai_tools(query="AI tools", limit=10):
 # ----------------------------
 # Markdown Formatter (Optional)
 # ----------------------------
+@metrics.timed_stage("markdown")
 def formatAIToolsToMarkdown(data):
     if not data:
         return "No AI tools found."
 
-    markdown = "## AI Tools Recommendations\n\n"
-    for i, tool in enumerate(data):
-        markdown += f"### {i+1}. {tool['title']}\n"
-        if tool.get('description'):
-            desc = tool['description'][:150] + "..." if len(tool['description']) > 150 else tool['description']
-            markdown += f"**Description:** {desc}\n"
-        markdown += f"**Link:** [Visit Website]({tool['url']})\n\n"
-    return markdown
+    # One string per tool, joined once. With only three short fields, per-item
+    # helper calls cost more than the formatting, so fields are read inline.
+    parts = ["## AI Tools Recommendations\n\n"]
+    for i, tool in enumerate(data, 1):
+        if type(tool) is AITool:
+            title, url, description = tool.title, tool.url, tool.description
+        else:
+            title, url, description = tool.get("title"), tool.get("url"), tool.get("description")
+        if description:
+            if len(description) > 150:
+                description = description[:150] + "..."
+            parts.append(f"### {i}. {title}\n**Description:** {description}\n**Link:** [Visit Website]({url})\n\n")
+        else:
+            parts.append(f"### {i}. {title}\n**Link:** [Visit Website]({url})\n\n")
+    return "".join(parts)
 
 # ----------------------------
 if __name__ == "__main__":
     query = input("Enter tool search query: ")
     tools = scrape_ai_tools_real_time(query, limit=5)
-    print(json.dumps(tools, indent=2, ensure_ascii=False))
+    # Cached results may be plain dicts; records.dumps handles both
+    print(records.dumps(tools, indent=2))
@@ -0,0 +1,253 @@
+"""Async (ASGI) serving mode.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8000
+
+/api/jobs, /api/courses and /api/ai-tools run on the event loop with
+``async_scrapers``, so one process can hold hundreds of scrapes in flight
+without a thread each. Every other route is passed to the Flask app in
+``main`` on a thread pool, so the API is the same in both modes.
+"""
+import asyncio
+import contextvars
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+import ai_tools_scraper
+import async_http
+import async_scrapers
+import courses_scraper
+import deadline
+import job_scraper
+import main
+import metrics
+import records
+import search_index
+
+# Threads running Flask for the routes that are not served natively
+ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", 32))
+_wsgi_executor = ThreadPoolExecutor(max_workers=ASGI_WSGI_THREADS, thread_name_prefix="wsgi")
+
+
+# ----------------------------
+# Native endpoints
+# ----------------------------
+async def _topics(query, action_type):
+    # Big queries get the same keyword extraction as the Flask endpoints
+    if len(query) <= 50:
+        return query
+    extracted = await asyncio.to_thread(main.extract_topics_from_query, query, action_type)
+    print(f"Big query detected. Original: '{query}' -> Extracted: '{extracted}'")
+    return extracted
+
+
+async def _search_items(kind, query, limit, params, live, location=None):
+    """Async counterpart of ``main.search_items`` (?source=live|index|merged)."""
+    mode = params.get('source', main.SEARCH_DEFAULT_SOURCE).lower()
+    if mode == 'index':
+        indexed = await asyncio.to_thread(search_index.search, kind, query, limit, location)
+        if indexed:
+            return indexed
+    results = await live() or []
+    if mode == 'merged':
+        indexed = await asyncio.to_thread(search_index.search, kind, query, limit, location)
+        return search_index.merge(indexed, results, limit)
+    return results
+
+
+async def ai_tools(params):
+    query = await _topics(params.get('query', 'AI tools'), "ai-tools")
+    limit = int(params.get('limit', 10))
+    result = await _search_items('ai_tools', query, limit, params,
+                                 lambda: async_scrapers.scrape_ai_tools_real_time(query, limit))
+    print(f"AI Tools: Found {len(result) if result else 0} real tools for '{query}'")
+    if params.get('format') == 'markdown':
+        return {"markdown": ai_tools_scraper.formatAIToolsToMarkdown(result), "data": result}
+    return result
+
+
+async def jobs(params):
+    query = await _topics(params.get('query', 'Software Engineer'), "jobs")
+    location = params.get('location', 'gujarat')
+    limit = int(params.get('limit', 10))
+    found = await _search_items('jobs', query, limit, params,
+                                lambda: async_scrapers.get_jobs(query, location, limit), location)
+    print(f"Jobs endpoint returned {len(found) if found else 0} items for '{query}' in '{location}'")
+    result = {"jobs": found}
+    if params.get('format') == 'markdown':
+        return {"markdown": job_scraper.formatJobsToMarkdown(result), "data": result}
+    return result
+
+
+async def courses(params):
+    query = await _topics(params.get('query', 'AI'), "courses")
+    limit = int(params.get('limit', 5))
+    found = await _search_items('courses', query, limit, params,
+                                lambda: async_scrapers.get_course_suggestions(query, limit))
+    print(f"Courses endpoint returned {len(found) if found else 0} items for '{query}'")
+    if params.get('format') == 'markdown':
+        return {"markdown": courses_scraper.formatCoursesToMarkdown(found), "data": found}
+    return found
+
+
+# path -> (handler, deadline budget name in main.API_DEADLINES)
+ROUTES = {
+    "/api/ai-tools": (ai_tools, "ai_tools"),
+    "/api/jobs": (jobs, "jobs"),
+    "/api/courses": (courses, "courses"),
+}
+
+
+async def _send_json(send, status, data):
+    body = records.encode(data, main.app.json.sort_keys)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"access-control-allow-origin", b"*"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _serve_native(scope, send, handler, budget_name):
+    started = time.perf_counter()
+    params = dict(parse_qsl(scope["query_string"].decode("latin-1")))
+    try:
+        with deadline.budget(main.budget_seconds(params.get('deadline'), budget_name)):
+            data = await handler(params)
+        status = 200
+    except deadline.DeadlineExceeded as e:
+        status, data = 504, {"error": f"Request deadline reached: {str(e)}"}
+    except Exception as e:
+        print(f"Error in {scope['path']}: {str(e)}")
+        status, data = 500, {"error": str(e)}
+    await _send_json(send, status, data)
+    metrics.request_duration.observe(time.perf_counter() - started, scope["path"], "GET", str(status))
+
+
+# ----------------------------
+# Flask bridge
+# ----------------------------
+def _environ(scope, body, size):
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"],
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope["headers"]:
+        name = name.decode("latin-1").lower()
+        value = value.decode("latin-1")
+        if name == "content-type":
+            environ["CONTENT_TYPE"] = value
+        elif name not in ("content-length", "transfer-encoding"):
+            key = "HTTP_" + name.upper().replace("-", "_")
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    # The body is fully received, so its length is known even for chunked requests
+    environ["CONTENT_LENGTH"] = str(size)
+    return environ
+
+
+async def _serve_flask(scope, receive, send):
+    # The request body is spooled (to disk past UPLOAD_SPOOL_MB) before Flask sees it;
+    # bodies over MAX_UPLOAD_MB are refused as they arrive
+    limit = main.app.config.get("MAX_CONTENT_LENGTH")
+    body = tempfile.SpooledTemporaryFile(max_size=main.UPLOAD_SPOOL_BYTES)
+    try:
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if limit is not None and size > limit:
+                await _send_json(send, 413, {"error": f"File too large. Maximum upload size is {main.MAX_UPLOAD_MB:g} MB."})
+                return
+            body.write(chunk)
+            if not message.get("more_body"):
+                break
+        body.seek(0)
+        await _run_wsgi(scope, send, body, size)
+    finally:
+        body.close()
+
+
+async def _run_wsgi(scope, send, body, size):
+    loop = asyncio.get_running_loop()
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+        return lambda data: None
+
+    # Executor threads differ from call to call, but stream_with_context keeps Flask's
+    # request context in context variables: every step runs in this one context, in order
+    ctx = contextvars.copy_context()
+
+    def call(func, *args):
+        return loop.run_in_executor(_wsgi_executor, ctx.run, func, *args)
+
+    result = await call(main.app, _environ(scope, body, size), start_response)
+    iterator = iter(result)
+    try:
+        await send({"type": "http.response.start", "status": started["status"], "headers": started["headers"]})
+        # Pull chunks one at a time so streamed (SSE) responses reach the client as they are produced
+        while True:
+            chunk = await call(next, iterator, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        if hasattr(result, "close"):
+            await call(result.close)
+
+
+# ----------------------------
+# ASGI entry point
+# ----------------------------
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await async_http.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    route = ROUTES.get(scope["path"])
+    if route is not None and scope["method"] == "GET":
+        await _serve_native(scope, send, *route)
+    else:
+        await _serve_flask(scope, receive, send)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("Starting ASGI Server...")
+    uvicorn.run(app, host='0.0.0.0', port=8000)
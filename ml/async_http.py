@@ -0,0 +1,98 @@
+import asyncio
+import os
+import random
+import time
+from urllib.parse import urlsplit
+
+try:
+    import httpx
+except ImportError:  # only needed for the ASGI serving mode
+    httpx = None
+
+import deadline
+import http_client
+import metrics
+import resilience
+
+# Connections the event loop may hold open at once (all hosts), and idle
+# keep-alive connections kept for reuse.
+HTTP_ASYNC_MAX_CONNECTIONS = int(os.getenv("HTTP_ASYNC_MAX_CONNECTIONS", 200))
+HTTP_ASYNC_KEEPALIVE = int(os.getenv("HTTP_ASYNC_KEEPALIVE", 50))
+
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Set before the first fetch to route traffic elsewhere (benchmarks use an httpx.MockTransport)
+transport = None
+
+_clients = {}
+
+
+def get_client():
+    """The shared ``httpx.AsyncClient`` for the running event loop."""
+    if httpx is None:
+        raise RuntimeError("httpx is not installed; pip install httpx to use async fetching")
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers=http_client.DEFAULT_HEADERS,
+            limits=httpx.Limits(max_connections=HTTP_ASYNC_MAX_CONNECTIONS,
+                                max_keepalive_connections=HTTP_ASYNC_KEEPALIVE),
+            follow_redirects=True,
+            transport=transport,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def aclose():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+@metrics.timed_stage("http_fetch")
+async def fetch(url, timeout=15, headers=None):
+    """Async counterpart of ``http_client.fetch``.
+
+    Same User-Agent rotation, per-host rate limit and circuit breaker,
+    deadline budget, 429/5xx retries (HTTP_RETRIES / HTTP_BACKOFF) and
+    per-host timing stats. Returns an ``httpx.Response`` with the body read.
+    """
+    host = urlsplit(url).hostname or url
+    request_timeout = deadline.timeout(timeout)
+    guard = resilience.guard(host)
+    wait = guard.reserve(min(resilience.HTTP_RATE_MAX_WAIT, request_timeout))
+    if wait:
+        await asyncio.sleep(wait)
+
+    request_headers = {"User-Agent": random.choice(http_client.USER_AGENTS)}
+    if headers:
+        request_headers.update(headers)
+
+    client = get_client()
+    start = time.perf_counter()
+    try:
+        for attempt in range(http_client.HTTP_RETRIES + 1):
+            async with client.stream("GET", url, headers=request_headers, timeout=request_timeout) as resp:
+                headers_at = time.perf_counter()
+                await resp.aread()
+            if resp.status_code not in _RETRY_STATUSES or attempt == http_client.HTTP_RETRIES:
+                break
+            backoff = http_client.HTTP_BACKOFF * 2 ** attempt
+            left = deadline.remaining()
+            if left is not None and left < backoff + request_timeout:
+                break  # no budget for another full attempt; keep this response
+            await asyncio.sleep(backoff)
+    except Exception as e:
+        if isinstance(e, httpx.TimeoutException) and request_timeout < timeout:
+            guard.release()
+        else:
+            guard.record(ok=False)
+        http_client.record(host, 0.0, time.perf_counter() - start, 0.0, 0, 0, error=True)
+        raise
+    done = time.perf_counter()
+    guard.record(ok=resp.status_code != 429 and resp.status_code < 500)
+    http_client.record(host, 0.0, headers_at - start, done - headers_at, len(resp.content), 0,
+                       error=resp.status_code >= 400)
+    return resp
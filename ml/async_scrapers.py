@@ -0,0 +1,196 @@
+"""Event-loop versions of the scrapers, used by the ASGI server (asgi.py).
+
+Each function mirrors its synchronous namesake: same URLs, same ``parse_*``
+functions (run on a worker thread so the loop stays responsive), same scrape
+cache, search index, stale-while-revalidate refresh and fallbacks. Only the
+network wait moves onto the event loop, via ``async_http.fetch``.
+"""
+import asyncio
+
+import ai_tools_scraper
+import async_http
+import cache
+import courses_scraper
+import deadline
+import job_scraper
+import metrics
+import singleflight
+
+scrape_flight = singleflight.async_group("async_scrape")
+
+
+async def gather(coros, timeout):
+    """asyncio counterpart of ``fanout.gather``: results aligned with ``coros``, None for failures or stragglers."""
+    timeout = deadline.remaining(timeout)
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    if not tasks:
+        return []
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+
+    results = []
+    for task in tasks:
+        name = task.get_coro().__name__
+        if task in pending:
+            task.cancel()
+            print(f"⏱️ {name} missed the {timeout:.1f}s deadline, dropping it")
+            results.append(None)
+        elif task.exception() is not None:
+            print(f"Error in {name}: {str(task.exception())}")
+            results.append(None)
+        else:
+            results.append(task.result())
+    return results
+
+
+async def _fetch_and_parse(url, timeout, parse, *parse_args, raise_for_status=False):
+    resp = await async_http.fetch(url, timeout=timeout)
+    if raise_for_status:
+        resp.raise_for_status()
+    return await asyncio.to_thread(parse, resp.text, *parse_args)
+
+
+async def _cached(source, sync_scraper, args, load, query, location=None, limit=None):
+    """Serve ``source`` results from the scrape cache, else await ``load()`` once per key and store it.
+
+    ``sync_scraper(*args)`` is what background refreshes run, from a thread.
+    Cache reads and writes (SQLite, search index ingest) run on a worker
+    thread, off the event loop.
+    """
+    key = cache.scrape_key(source, query, location, limit)
+
+    def reload():
+        return cache.scrape_flight.do(key, lambda: cache.store(source, key, sync_scraper.uncached(*args)))
+
+    result = await asyncio.to_thread(cache.lookup, source, key, reload)
+    if result is not None:
+        return result
+
+    async def fetch():
+        return await asyncio.to_thread(cache.store, source, key, await load())
+
+    return await scrape_flight.do(key, fetch)
+
+
+# ----------------------------
+# Jobs
+# ----------------------------
+async def scrape_linkedin_jobs(query, location="gujarat", limit=10):
+    async def load():
+        try:
+            jobs = await _fetch_and_parse(job_scraper.linkedin_search_url(query, location), 15,
+                                          job_scraper.parse_linkedin_jobs, location, limit)
+            print(f"LinkedIn: Found {len(jobs)} jobs for '{query}' in '{location}'")
+            return jobs
+        except Exception as e:
+            print(f"Error scraping LinkedIn jobs: {str(e)}")
+            return []
+    return await _cached("linkedin", job_scraper.scrape_linkedin_jobs, (query, location, limit), load,
+                         query, location, limit)
+
+
+async def scrape_naukri_jobs(query, location="gujarat", limit=10):
+    async def load():
+        try:
+            jobs = await _fetch_and_parse(job_scraper.naukri_search_url(query, location), 15,
+                                          job_scraper.parse_naukri_jobs, location, limit)
+            print(f"Naukri: Found {len(jobs)} jobs for '{query}' in '{location}'")
+            return jobs
+        except Exception as e:
+            print(f"Error scraping Naukri jobs: {str(e)}")
+            return []
+    return await _cached("naukri", job_scraper.scrape_naukri_jobs, (query, location, limit), load,
+                         query, location, limit)
+
+
+@singleflight.coalesce("async_jobs")
+async def get_jobs(query, location="gujarat", limit=10, sources=None):
+    scrapers = {
+        "linkedin": lambda: scrape_linkedin_jobs(query, "india", limit),
+        "naukri": lambda: scrape_naukri_jobs(query, location, limit),
+    }
+    names = [name for name in (sources or job_scraper.JOB_SOURCES) if name in scrapers]
+    results = await gather([scrapers[name]() for name in names], job_scraper.JOB_SEARCH_DEADLINE)
+    return job_scraper.merge_jobs(enumerate(results), limit, query)
+
+
+# ----------------------------
+# Courses
+# ----------------------------
+async def scrape_coursera_courses(query, limit=5):
+    async def load():
+        try:
+            return await _fetch_and_parse(courses_scraper.coursera_search_url(query), 15,
+                                          courses_scraper.parse_coursera_courses, limit)
+        except Exception as e:
+            print(f"Error scraping Coursera: {str(e)}")
+            return []
+    return await _cached("coursera", courses_scraper.scrape_coursera_courses, (query, limit), load,
+                         query, limit=limit)
+
+
+async def scrape_udemy_courses(query, limit=5):
+    async def load():
+        try:
+            return await _fetch_and_parse(courses_scraper.udemy_search_url(query), 10,
+                                          courses_scraper.parse_udemy_courses, limit)
+        except Exception as e:
+            print(f"Error scraping Udemy: {str(e)}")
+            return []
+    return await _cached("udemy", courses_scraper.scrape_udemy_courses, (query, limit), load,
+                         query, limit=limit)
+
+
+@singleflight.coalesce("async_courses")
+async def get_course_suggestions(query, limit=5):
+    results = await gather([
+        scrape_coursera_courses(query, limit),
+        scrape_udemy_courses(query, limit),
+    ], courses_scraper.COURSE_SEARCH_DEADLINE)
+    return courses_scraper.merge_courses(enumerate(results), query, limit)
+
+
+# ----------------------------
+# AI tools
+# ----------------------------
+async def scrape_aixploria_tools(query="AI tools", limit=5):
+    """Raises on network/HTTP errors, like the synchronous version."""
+    async def load():
+        return await _fetch_and_parse(ai_tools_scraper.aixploria_search_url(query), 20,
+                                      ai_tools_scraper.parse_aixploria_tools, limit, raise_for_status=True)
+    return await _cached("aixploria", ai_tools_scraper.scrape_aixploria_tools, (query, limit), load,
+                         query, limit=limit)
+
+
+async def scrape_duckduckgo_tools(query="AI tools", limit=10):
+    """Raises on network/HTTP errors, like the synchronous version."""
+    async def load():
+        return await _fetch_and_parse(ai_tools_scraper.duckduckgo_search_url(query), 15,
+                                      ai_tools_scraper.parse_duckduckgo_tools, limit, raise_for_status=True)
+    return await _cached("duckduckgo", ai_tools_scraper.scrape_duckduckgo_tools, (query, limit), load,
+                         query, limit=limit)
+
+
+async def scrape_ai_tools_fallback(query="AI tools", limit=10):
+    metrics.fallbacks.inc("scrape_ai_tools_fallback")
+    try:
+        tools = await scrape_duckduckgo_tools(query, limit)
+        if tools:
+            print(f"🔄 DuckDuckGo fallback: {len(tools)} tools found")
+            return ai_tools_scraper.merge_tools([(0, tools)], limit, query)
+        return ai_tools_scraper.generate_mock_ai_tools(query, limit)
+    except Exception as e:
+        print(f"⚠️ Fallback error: {e}")
+        return ai_tools_scraper.generate_mock_ai_tools(query, limit)
+
+
+@singleflight.coalesce("async_ai_tools")
+async def scrape_ai_tools_real_time(query="AI tools", limit=5):
+    try:
+        tools = await scrape_aixploria_tools(query, limit)
+        if tools:
+            print(f"✅ Found {len(tools)} tools on Aixploria for '{query}'")
+            return ai_tools_scraper.merge_tools([(0, tools)], limit, query)
+        return await scrape_ai_tools_fallback(query, limit)
+    except Exception as e:
+        print(f"⚠️ Error scraping Aixploria: {e}")
+        return await scrape_ai_tools_fallback(query, limit)
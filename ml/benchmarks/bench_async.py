@@ -0,0 +1,133 @@
+"""Compare the Flask (thread per request) and ASGI (event loop) serving paths.
+
+Both serve the same endpoint against ``fixtures/`` with a simulated upstream
+latency, at a fixed number of concurrent clients. Every request uses a
+distinct query so the scrape cache and request coalescing don't hide the
+upstream wait. Reports throughput, latency percentiles and peak thread count.
+Needs httpx.
+
+    python benchmarks/bench_async.py --concurrency 64 --requests 256 --latency 0.2
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Measure the serving model, not the politeness limits or the on-disk index
+os.environ.setdefault("HTTP_RATE_LIMIT", "1000000")
+os.environ.setdefault("HTTP_RATE_BURST", "1000000")
+os.environ.setdefault("SEARCH_INDEX", "0")
+os.environ.setdefault("SCRAPE_REFRESH", "0")
+
+import httpx  # noqa: E402
+
+import asgi  # noqa: E402
+import async_http  # noqa: E402
+import cache  # noqa: E402
+import http_client  # noqa: E402
+import main  # noqa: E402
+import replay  # noqa: E402
+
+
+class PeakThreads:
+    """Sample the process's thread count in the background and keep the maximum."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def summarize(latencies, wall, peak_threads):
+    latencies = sorted(latencies)
+    return {
+        "req_per_s": round(len(latencies) / wall, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1),
+        "peak_threads": peak_threads,
+    }
+
+
+def run_flask(path, requests, concurrency):
+    client = main.app.test_client()
+
+    def one(i):
+        start = time.perf_counter()
+        resp = client.get(path.format(i=i))
+        assert resp.status_code == 200, resp.status_code
+        return time.perf_counter() - start
+
+    with PeakThreads() as threads, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        latencies = list(pool.map(one, range(requests)))
+        wall = time.perf_counter() - start
+    return summarize(latencies, wall, threads.peak)
+
+
+async def _run_asgi(path, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=asgi.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                resp = await client.get(path.format(i=i))
+                assert resp.status_code == 200, resp.status_code
+                return time.perf_counter() - start
+
+        with PeakThreads() as threads:
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(one(i) for i in range(requests)))
+            wall = time.perf_counter() - start
+    await async_http.aclose()
+    return summarize(latencies, wall, threads.peak)
+
+
+def run_asgi(path, requests, concurrency):
+    return asyncio.run(_run_asgi(path, requests, concurrency))
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--latency", type=float, default=0.2, help="simulated upstream latency in seconds")
+    parser.add_argument("--path", default="/api/courses?query=python{i}&limit=5")
+    args = parser.parse_args()
+
+    replay.install(http_client.session, replay.ReplayAdapter(latency=args.latency))
+    async_http.transport = replay.async_transport(latency=args.latency)
+
+    print(f"{args.requests} x {args.path} at concurrency {args.concurrency}, upstream latency {args.latency}s")
+    print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'threads':>9}")
+    for name, run in (("flask", run_flask), ("asgi", run_asgi)):
+        cache.scrape_cache.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run(args.path, args.requests, args.concurrency)
+        print(f"{name:<8}{result['req_per_s']:>10.1f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+              f"{result['max_ms']:>10.1f}{result['peak_threads']:>9}")
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,117 @@
+"""Compare HTML parse cost per fixture page across parser backends.
+
+For every scraper page this runs the real ``parse_*`` function under three
+setups and reports CPU time per page, peak traced memory and items found:
+
+* ``html.parser/full``  - what the scrapers used to do
+* ``html.parser/scoped`` - same parser, restricted with the scraper's SoupStrainer
+* ``lxml/scoped``        - C-backed parser plus the strainer (the default when lxml is installed)
+
+Aixploria cards are matched by content, not by a wrapper the strainer could
+select, so that page is always parsed whole and its variants are labelled
+``full``.
+
+    python benchmarks/bench_parsers.py [--iterations 20] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_tools_scraper  # noqa: E402
+import courses_scraper  # noqa: E402
+import job_scraper  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Pages whose parse_* function uses no SoupStrainer
+UNSCOPED = {"aixploria"}
+
+PAGES = {
+    "linkedin": (job_scraper, lambda html: job_scraper.parse_linkedin_jobs(html, "gujarat", 10)),
+    "naukri": (job_scraper, lambda html: job_scraper.parse_naukri_jobs(html, "gujarat", 10)),
+    "coursera": (courses_scraper, lambda html: courses_scraper.parse_coursera_courses(html, 10)),
+    "udemy": (courses_scraper, lambda html: courses_scraper.parse_udemy_courses(html, 10)),
+    "aixploria": (ai_tools_scraper, lambda html: ai_tools_scraper.parse_aixploria_tools(html, 10)),
+    "duckduckgo": (ai_tools_scraper, lambda html: ai_tools_scraper.parse_duckduckgo_tools(html, 10)),
+}
+
+
+def available_variants():
+    variants = [("html.parser", False), ("html.parser", True)]
+    try:
+        import lxml  # noqa: F401
+        variants.append(("lxml", True))
+    except ImportError:
+        print("lxml not installed; skipping the lxml variant")
+    return variants
+
+
+def soup_factory(parser, scoped):
+    def make_soup(markup, parse_only=None, parser_override=None):
+        return BeautifulSoup(markup, parser, parse_only=parse_only if scoped else None)
+    return make_soup
+
+
+def measure(module, parse, html, parser, scoped, iterations):
+    original = module.make_soup
+    module.make_soup = soup_factory(parser, scoped)
+    try:
+        items = parse(html)
+
+        start = time.process_time()
+        for _ in range(iterations):
+            parse(html)
+        cpu_ms = (time.process_time() - start) * 1000 / iterations
+
+        tracemalloc.start()
+        parse(html)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        module.make_soup = original
+    return {"cpu_ms": round(cpu_ms, 3), "peak_kb": round(peak / 1024, 1), "items": len(items), "result": items}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    variants = available_variants()
+    report = {}
+    print(f"{'page':<12}{'variant':<22}{'cpu ms/page':>12}{'peak KB':>10}{'items':>7}")
+    for name, (module, parse) in PAGES.items():
+        with open(os.path.join(FIXTURES_DIR, f"{name}.html"), encoding="utf-8") as f:
+            html = f.read()
+        report[name] = {}
+        baseline = None
+        for parser_name, scoped in variants:
+            scoped = scoped and name not in UNSCOPED
+            label = f"{parser_name}/{'scoped' if scoped else 'full'}"
+            if label in report[name]:
+                continue
+            result = measure(module, parse, html, parser_name, scoped, args.iterations)
+            if baseline is None:
+                baseline = result["result"]
+            elif result["result"] != baseline:
+                print(f"  ! {name} {label} extracted different items than html.parser/full")
+            del result["result"]
+            report[name][label] = result
+            print(f"{name:<12}{label:<22}{result['cpu_ms']:>12.2f}{result['peak_kb']:>10.0f}{result['items']:>7}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
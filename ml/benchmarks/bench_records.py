@@ -0,0 +1,203 @@
+"""Compare result records (records.py) with the dicts the scrapers used to return.
+
+Items are parsed from the fixture pages, then for each kind (jobs, courses,
+AI tools) this reports:
+
+* memory per item held in a cache: the container only, the strings are shared
+* JSON serialization time per response of ``--limit`` items: the old
+  ``jsonify`` path (``json.dumps`` with Flask's ``sort_keys``/``ensure_ascii``)
+  vs ``records.encode``, with orjson and with the stdlib fallback
+* markdown rendering time per response: the old ``+=`` formatters vs the
+  single-pass ones
+
+    python benchmarks/bench_records.py [--items 20000] [--iterations 2000] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_tools_scraper  # noqa: E402
+import courses_scraper  # noqa: E402
+import job_scraper  # noqa: E402
+import records  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def legacy_jobs_markdown(data):
+    if not data.get("jobs") or len(data["jobs"]) == 0:
+        return "No jobs found."
+    markdown = "## Job Search Results\n\n"
+    for i, job in enumerate(data["jobs"]):
+        markdown += f"### {i + 1}. {job['title']}\n"
+        markdown += f"**Company:** {job['company']}\n"
+        if job.get('location'):
+            markdown += f"**Location:** {job['location']}\n"
+        if job.get('description'):
+            description = job['description'][:150] + "..." if len(job['description']) > 150 else job['description']
+            markdown += f"**Description:** {description}\n"
+        markdown += f"**Link:** [Apply Here]({job['link']})\n\n"
+    return markdown
+
+
+def legacy_courses_markdown(data):
+    if not data:
+        return "No courses found."
+    markdown = "## Course Recommendations\n\n"
+    for i, course in enumerate(data):
+        title = course.get('title', f'Course {i+1}')
+        provider = course.get('provider', '')
+        platform = course.get('platform', '')
+        url = course.get('url', '#')
+        markdown += f"### {i + 1}. {title}\n"
+        if provider:
+            markdown += f"**Instructor/Provider:** {provider}\n"
+        if platform:
+            markdown += f"**Platform:** {platform}\n"
+        markdown += f"**Link:** [View Course]({url})\n\n"
+    return markdown
+
+
+def legacy_tools_markdown(data):
+    if not data:
+        return "No AI tools found."
+    markdown = "## AI Tools Recommendations\n\n"
+    for i, tool in enumerate(data):
+        markdown += f"### {i+1}. {tool['title']}\n"
+        if tool.get('description'):
+            desc = tool['description'][:150] + "..." if len(tool['description']) > 150 else tool['description']
+            markdown += f"**Description:** {desc}\n"
+        markdown += f"**Link:** [Visit Website]({tool['url']})\n\n"
+    return markdown
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES_DIR, f"{name}.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def parsed_items():
+    return {
+        "jobs": (job_scraper.parse_linkedin_jobs(fixture("linkedin"), "gujarat", 50)
+                 + job_scraper.parse_naukri_jobs(fixture("naukri"), "gujarat", 50)),
+        "courses": (courses_scraper.parse_coursera_courses(fixture("coursera"), 50)
+                    + courses_scraper.parse_udemy_courses(fixture("udemy"), 50)
+                    + courses_scraper.merge_courses([], "python", 5)),
+        "ai_tools": (ai_tools_scraper.parse_aixploria_tools(fixture("aixploria"), 50)
+                     + ai_tools_scraper.parse_duckduckgo_tools(fixture("duckduckgo"), 50)),
+    }
+
+
+KINDS = {
+    "jobs": (lambda items: legacy_jobs_markdown({"jobs": items}),
+             lambda items: job_scraper.formatJobsToMarkdown({"jobs": items})),
+    "courses": (legacy_courses_markdown, courses_scraper.formatCoursesToMarkdown),
+    "ai_tools": (legacy_tools_markdown, ai_tools_scraper.formatAIToolsToMarkdown),
+}
+
+
+def bytes_per_item(build, samples, count):
+    """Bytes allocated per container built by ``build(sample)``, strings excluded (they are shared)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [build(samples[i % len(samples)]) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    list_bytes = sys.getsizeof(held)
+    return (after - before - list_bytes) / count
+
+
+def per_call_us(func, arg, iterations, repeat=5):
+    """Best of ``repeat`` runs, in microseconds per call."""
+    func(arg)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+def legacy_json(obj):
+    # What Flask 2.3's DefaultJSONProvider does for jsonify
+    return json.dumps(obj, ensure_ascii=True, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def record_json(obj):
+    # What RecordJSONProvider does for jsonify (Flask's default sort_keys=True)
+    return records.encode(obj, sort_keys=True)
+
+
+def stdlib_encode(obj):
+    orjson, records.orjson = records.orjson, None
+    try:
+        return record_json(obj)
+    finally:
+        records.orjson = orjson
+
+
+def run(kind, items, args):
+    dicts = [item.to_dict() for item in items]
+    cls = type(items[0])
+    fields = [tuple(getattr(item, name) for name in cls.__slots__) for item in items]
+    names = cls.__slots__
+
+    memory_dict = bytes_per_item(lambda values: {n: v for n, v in zip(names, values) if v is not None},
+                                 fields, args.items)
+    memory_record = bytes_per_item(lambda values: cls(*values), fields, args.items)
+
+    page_dicts, page_records = dicts[:args.limit], items[:args.limit]
+    assert legacy_json(page_dicts) == stdlib_encode(page_records)
+    assert json.loads(legacy_json(page_dicts)) == json.loads(record_json(page_records))
+    legacy_md, new_md = KINDS[kind]
+    assert legacy_md(page_dicts) == new_md(page_records)
+
+    result = {
+        "kind": kind,
+        "bytes_dict": round(memory_dict, 1),
+        "bytes_record": round(memory_record, 1),
+        "json_legacy_us": round(per_call_us(legacy_json, page_dicts, args.iterations), 2),
+        "json_stdlib_us": round(per_call_us(stdlib_encode, page_records, args.iterations), 2),
+        "markdown_legacy_us": round(per_call_us(legacy_md, page_dicts, args.iterations), 2),
+        "markdown_us": round(per_call_us(new_md, page_records, args.iterations), 2),
+    }
+    if records.orjson is not None:
+        result["json_orjson_us"] = round(per_call_us(record_json, page_records, args.iterations), 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20000, help="items built for the memory measurement")
+    parser.add_argument("--limit", type=int, default=10, help="items per serialized response")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    if records.orjson is None:
+        print("orjson not installed; skipping the orjson variant")
+
+    report = [run(kind, items, args) for kind, items in parsed_items().items()]
+
+    header = (f"{'kind':<9} {'B/dict':>7} {'B/rec':>6} {'json old':>9} {'stdlib':>8} {'orjson':>8}"
+              f" {'md old':>8} {'md new':>8}   (µs per {args.limit}-item response)")
+    print(header)
+    print("-" * len(header))
+    for r in report:
+        print(f"{r['kind']:<9} {r['bytes_dict']:>7} {r['bytes_record']:>6} {r['json_legacy_us']:>9}"
+              f" {r['json_stdlib_us']:>8} {r.get('json_orjson_us', '-'):>8}"
+              f" {r['markdown_legacy_us']:>8} {r['markdown_us']:>8}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"limit": args.limit, "results": report}, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
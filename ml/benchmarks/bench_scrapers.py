@@ -0,0 +1,189 @@
+"""Replay recorded pages through the real scrapers and report their cost.
+
+Every ``scrape_*`` entry point runs end to end (``http_client.fetch``,
+parsing, extraction) against ``fixtures/`` through a transport adapter, with
+the scrape cache cleared before each call. Per scraper it reports wall time,
+the share of it spent in the ``parse_*`` step, peak traced allocations and
+the number of items extracted.
+
+    python benchmarks/bench_scrapers.py --json results.json
+    python benchmarks/bench_scrapers.py --compare results.json   # exit 1 on regression
+    python benchmarks/bench_scrapers.py --record                  # refresh fixtures from the live sites
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Measure fetch + parse, not the per-host rate limit sleeps or the on-disk index.
+# Must be set before the scraper modules read them.
+os.environ.setdefault("HTTP_RATE_LIMIT", "1000000")
+os.environ.setdefault("HTTP_RATE_BURST", "1000000")
+os.environ.setdefault("SEARCH_INDEX", "0")
+os.environ.setdefault("SCRAPE_REFRESH", "0")
+
+import ai_tools_scraper  # noqa: E402
+import cache  # noqa: E402
+import courses_scraper  # noqa: E402
+import html_parser  # noqa: E402
+import http_client  # noqa: E402
+import job_scraper  # noqa: E402
+import replay  # noqa: E402
+
+QUERY = "python"
+
+# name -> (scraper call, module and name of the parse step it runs)
+SCRAPERS = {
+    "scrape_linkedin_jobs": (lambda: job_scraper.scrape_linkedin_jobs(QUERY, "india", 10), job_scraper, "parse_linkedin_jobs"),
+    "scrape_naukri_jobs": (lambda: job_scraper.scrape_naukri_jobs(QUERY, "gujarat", 10), job_scraper, "parse_naukri_jobs"),
+    "scrape_coursera_courses": (lambda: courses_scraper.scrape_coursera_courses(QUERY, 10), courses_scraper, "parse_coursera_courses"),
+    "scrape_udemy_courses": (lambda: courses_scraper.scrape_udemy_courses(QUERY, 10), courses_scraper, "parse_udemy_courses"),
+    "scrape_ai_tools_real_time": (lambda: ai_tools_scraper.scrape_ai_tools_real_time(QUERY, 10), ai_tools_scraper, "parse_aixploria_tools"),
+    "scrape_ai_tools_fallback": (lambda: ai_tools_scraper.scrape_ai_tools_fallback(QUERY, 10), ai_tools_scraper, "parse_duckduckgo_tools"),
+}
+
+# Metrics where a higher number is worse, checked by --compare
+COMPARED_METRICS = ("wall_ms", "parse_ms", "peak_kb")
+
+
+@contextlib.contextmanager
+def timed_parse(module, name):
+    """Accumulate the time spent in ``module.<name>`` while the block runs."""
+    original = getattr(module, name)
+    spent = [0.0]
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            spent[0] += time.perf_counter() - start
+
+    setattr(module, name, wrapper)
+    try:
+        yield spent
+    finally:
+        setattr(module, name, original)
+
+
+def run_once(call):
+    cache.scrape_cache.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        return call()
+
+
+def bench(call, module, parse_name, iterations):
+    items = run_once(call)  # warm-up, also the result we report
+
+    with timed_parse(module, parse_name) as parse_spent:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run_once(call)
+        wall = time.perf_counter() - start
+
+    tracemalloc.start()
+    run_once(call)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_ms": round(wall * 1000 / iterations, 3),
+        "parse_ms": round(parse_spent[0] * 1000 / iterations, 3),
+        "peak_kb": round(peak / 1024, 1),
+        "items": len(items or []),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print per-metric deltas against a previous run; return True on regression."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressed = False
+    print(f"\nCompared with {baseline_path} (threshold {threshold:.0%}):")
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old:
+            print(f"  {name}: no baseline")
+            continue
+        for metric in COMPARED_METRICS:
+            if not old.get(metric):
+                continue
+            change = (result[metric] - old[metric]) / old[metric]
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressed = True
+            print(f"  {name:<28}{metric:<10}{old[metric]:>10.2f} -> {result[metric]:>10.2f} ({change:+.0%}){flag}")
+        if result["items"] != old["items"]:
+            print(f"  {name:<28}items     {old['items']:>10} -> {result['items']:>10}  CHANGED")
+            regressed = True
+    return regressed
+
+
+def record():
+    replay.install(http_client.session, replay.RecordingAdapter())
+    for name, (call, _, _) in SCRAPERS.items():
+        print(f"{name}: {len(run_once(call) or [])} items")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="previous --json output to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown that counts as a regression (default 0.15)")
+    parser.add_argument("--record", action="store_true", help="re-record fixtures from the live sites")
+    args = parser.parse_args()
+
+    if args.record:
+        record()
+        return
+
+    replay.install(http_client.session, replay.ReplayAdapter())
+
+    results = {}
+    print(f"{'scraper':<28}{'wall ms':>10}{'parse ms':>10}{'peak KB':>10}{'items':>7}")
+    for name, (call, module, parse_name) in SCRAPERS.items():
+        result = bench(call, module, parse_name, args.iterations)
+        results[name] = result
+        print(f"{name:<28}{result['wall_ms']:>10.2f}{result['parse_ms']:>10.2f}{result['peak_kb']:>10.0f}{result['items']:>7}")
+
+    if args.json:
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "html_parser": html_parser.HTML_PARSER,
+                "iterations": args.iterations,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.json}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Generate the offline HTML fixtures used by the benchmarks.
+
+Each page mirrors the markup the matching scraper looks for (result cards,
+JSON-LD blocks, DuckDuckGo result links) wrapped in the kind of bulk a real
+results page carries: inline styles and scripts, navigation and footers.
+Output is deterministic so fixtures only change when this script does.
+
+    python benchmarks/make_fixtures.py
+"""
+import json
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+RESULTS_PER_PAGE = 25
+
+TOPICS = ["Python", "Data Science", "Machine Learning", "React", "Cloud", "DevOps", "SQL", "Java"]
+COMPANIES = ["Infosys", "TCS", "Wipro", "Zoho", "Freshworks", "Razorpay", "Swiggy", "Flipkart"]
+CITIES = ["Ahmedabad, Gujarat", "Surat, Gujarat", "Vadodara, Gujarat", "Bengaluru, Karnataka"]
+WORDS = ("learn build deploy scalable model data pipeline team remote hybrid junior senior "
+         "analytics dashboard api service cloud testing design agile product").split()
+
+
+def sentence(rng, n=18):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def page(rng, title, body):
+    """Wrap ``body`` in realistic page chrome: styles, scripts, nav and footer."""
+    style = "\n".join(f".c{i}{{margin:{i % 7}px;padding:{i % 5}px;color:#{i * 2654435761 % 0xFFFFFF:06x}}}" for i in range(1500))
+    script = "var state = " + json.dumps({f"k{i}": sentence(rng, 6) for i in range(600)}) + ";"
+    nav = "".join(f'<li class="nav-item"><a href="/section/{i}">{rng.choice(WORDS).title()}</a></li>' for i in range(120))
+    footer = "".join(f'<div class="footer-col"><h5>{rng.choice(WORDS).title()}</h5><p>{sentence(rng)}</p></div>' for i in range(40))
+    return (
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{title}</title>"
+        f"<style>{style}</style><script>{script}</script></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main><div class=\"layout\"><aside>{sentence(rng, 60)}</aside>{body}</div></main>"
+        f"<footer>{footer}</footer></body></html>"
+    )
+
+
+def linkedin(rng):
+    cards = []
+    for i in range(RESULTS_PER_PAGE):
+        role = f"{rng.choice(TOPICS)} Developer"
+        cards.append(
+            f'<li><div class="base-card job-search-card">'
+            f'<a class="base-card__full-link" href="https://in.linkedin.com/jobs/view/{1000 + i}"></a>'
+            f'<div class="base-search-card__info"><h3 class="base-search-card__title">{role}</h3>'
+            f'<h4 class="base-search-card__subtitle"><a>{rng.choice(COMPANIES)}</a></h4>'
+            f'<div class="base-search-card__metadata"><span class="job-search-card__location">{rng.choice(CITIES)}</span>'
+            f'<time>{i + 1} days ago</time></div>'
+            f'<p class="job-search-card__snippet">{sentence(rng, 30)}</p></div></div></li>'
+        )
+    return page(rng, "Jobs | LinkedIn", f'<ul class="jobs-search__results-list">{"".join(cards)}</ul>')
+
+
+def naukri(rng):
+    cards = []
+    for i in range(RESULTS_PER_PAGE):
+        role = f"{rng.choice(TOPICS)} Engineer"
+        cards.append(
+            f'<article class="jobTuple"><div class="info">'
+            f'<a class="title" href="https://www.naukri.com/job-listings-{2000 + i}">{role}</a>'
+            f'<a class="subTitle">{rng.choice(COMPANIES)}</a>'
+            f'<ul><li class="location"><span>{rng.choice(CITIES)}</span></li></ul>'
+            f'<div class="job-description">{sentence(rng, 30)}</div></div></article>'
+        )
+    return page(rng, "Jobs | Naukri", f'<section class="list">{"".join(cards)}</section>')
+
+
+def coursera(rng):
+    cards = []
+    for i in range(RESULTS_PER_PAGE):
+        cards.append(
+            f'<li data-testid="search-result"><div class="cds-ProductCard">'
+            f'<a href="/learn/{rng.choice(TOPICS).lower().replace(" ", "-")}-{i}">'
+            f'<h3 data-testid="search-result-title">{rng.choice(TOPICS)} Specialization {i + 1}</h3></a>'
+            f'<p data-testid="partner-name">{rng.choice(COMPANIES)} University</p>'
+            f'<p class="skills">{sentence(rng, 20)}</p></div></li>'
+        )
+    return page(rng, "Search | Coursera", f'<ul class="search-results">{"".join(cards)}</ul>')
+
+
+def udemy(rng):
+    blocks = []
+    for i in range(RESULTS_PER_PAGE):
+        data = {
+            "@context": "https://schema.org",
+            "@type": "Course",
+            "name": f"The Complete {rng.choice(TOPICS)} Course {i + 1}",
+            "description": sentence(rng, 25),
+            "url": f"https://www.udemy.com/course/complete-course-{i}/",
+            "provider": {"@type": "Organization", "name": "Udemy"},
+        }
+        blocks.append(f'<script type="application/ld+json">{json.dumps(data)}</script>')
+        blocks.append(f'<div class="course-card"><h3>{data["name"]}</h3><p>{sentence(rng, 20)}</p></div>')
+    return page(rng, "Search | Udemy", f'<div class="results">{"".join(blocks)}</div>')
+
+
+def aixploria(rng):
+    cards = []
+    for i in range(RESULTS_PER_PAGE):
+        name = f"{rng.choice(WORDS).title()}{rng.choice(WORDS).title()} AI {i + 1}"
+        cards.append(
+            f'<div class="post-card"><div class="post-info">'
+            f'<a class="dark-title" href="https://www.aixploria.com/en/tool-{i}/">{name}</a></div>'
+            f'<p class="post-excerpt">{sentence(rng, 25)}</p>'
+            f'<a class="visit-site-button4" href="https://tool-{i}.example.com/">Visit</a></div>'
+        )
+    return page(rng, "Search | Aixploria", f'<div class="post-list">{"".join(cards)}</div>')
+
+
+def duckduckgo(rng):
+    results = []
+    for i in range(RESULTS_PER_PAGE):
+        results.append(
+            f'<div class="result results_links"><div class="links_main result__body">'
+            f'<h2 class="result__title"><a class="result__a" href="https://www.aixploria.com/en/tool-{i}/">'
+            f'{rng.choice(WORDS).title()} AI Tool {i + 1}</a></h2>'
+            f'<a class="result__snippet">{sentence(rng, 25)}</a></div></div>'
+        )
+    return page(rng, "DuckDuckGo", f'<div id="links" class="results">{"".join(results)}</div>')
+
+
+PAGES = {
+    "linkedin": linkedin,
+    "naukri": naukri,
+    "coursera": coursera,
+    "udemy": udemy,
+    "aixploria": aixploria,
+    "duckduckgo": duckduckgo,
+}
+
+
+if __name__ == "__main__":
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for name, build in PAGES.items():
+        path = os.path.join(FIXTURES_DIR, f"{name}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(build(random.Random(name)))
+        print(f"Wrote {path} ({os.path.getsize(path) // 1024} KB)")
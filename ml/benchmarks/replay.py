@@ -0,0 +1,104 @@
+"""Serve (or capture) scraper traffic from ``fixtures/`` instead of the network.
+
+``ReplayAdapter`` is mounted on ``http_client.session`` so the real scraper
+code, including ``http_client.fetch``, runs unchanged against saved pages.
+``RecordingAdapter`` does the opposite: it lets requests through and saves
+each response body as the fixture for its host. ``async_transport`` serves the
+same pages to ``async_http`` (needs httpx).
+"""
+import asyncio
+import os
+import time
+from urllib.parse import urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+HOST_FIXTURES = {
+    "www.linkedin.com": "linkedin",
+    "www.naukri.com": "naukri",
+    "www.coursera.org": "coursera",
+    "www.udemy.com": "udemy",
+    "www.aixploria.com": "aixploria",
+    "duckduckgo.com": "duckduckgo",
+}
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURES_DIR, f"{name}.html")
+
+
+def load_pages():
+    pages = {}
+    for host, name in HOST_FIXTURES.items():
+        with open(fixture_path(name), "rb") as f:
+            pages[host] = f.read()
+    return pages
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answer every request from the fixture for its host; 404 otherwise.
+
+    ``latency`` seconds are slept per request to stand in for the network.
+    """
+
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+        self.pages = load_pages()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.latency:
+            time.sleep(self.latency)
+        body = self.pages.get(urlsplit(request.url).hostname)
+        resp = Response()
+        resp.status_code = 200 if body is not None else 404
+        resp.reason = "OK" if body is not None else "Not Found"
+        resp._content = body or b""
+        resp.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+        resp.encoding = "utf-8"
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        return resp
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Pass requests through and save each successful body as its host's fixture."""
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        name = HOST_FIXTURES.get(urlsplit(request.url).hostname)
+        if name and resp.status_code == 200:
+            with open(fixture_path(name), "wb") as f:
+                f.write(resp.content)
+            print(f"Recorded {request.url} -> {fixture_path(name)}")
+        return resp
+
+
+def async_transport(latency=0.0):
+    """An ``httpx.MockTransport`` answering from the fixtures after ``latency`` seconds."""
+    import httpx
+
+    pages = load_pages()
+
+    async def handle(request):
+        if latency:
+            await asyncio.sleep(latency)
+        body = pages.get(request.url.host)
+        return httpx.Response(200 if body is not None else 404, content=body or b"",
+                              headers={"Content-Type": "text/html; charset=utf-8"})
+
+    return httpx.MockTransport(handle)
+
+
+def install(session, adapter):
+    """Route all of ``session``'s http(s) traffic through ``adapter``."""
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
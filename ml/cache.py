@@ -0,0 +1,369 @@
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import records
+import refresher
+import search_index
+import singleflight
+
+_MISSING = object()
+
+# Seconds a scrape result stays fresh, per source. Override any of these with
+# SCRAPE_CACHE_TTL_<SOURCE>, e.g. SCRAPE_CACHE_TTL_LINKEDIN=300.
+DEFAULT_TTLS = {
+    "linkedin": 600,
+    "naukri": 600,
+    "coursera": 3600,
+    "udemy": 3600,
+    "aixploria": 1800,
+    "duckduckgo": 1800,
+}
+DEFAULT_TTL = 600
+
+# Popular scrape results are refreshed in the background before they expire,
+# and expired ones are served stale (for SCRAPE_CACHE_STALE_<SOURCE> seconds,
+# default one more TTL) while a refresh runs. SCRAPE_REFRESH=0 turns both off.
+SCRAPE_REFRESH = os.getenv("SCRAPE_REFRESH", "1") != "0"
+SCRAPE_REFRESH_TOP_N = int(os.getenv("SCRAPE_REFRESH_TOP_N", 10))
+SCRAPE_REFRESH_INTERVAL = float(os.getenv("SCRAPE_REFRESH_INTERVAL", 30))
+SCRAPE_REFRESH_LEAD = float(os.getenv("SCRAPE_REFRESH_LEAD", 60))
+SCRAPE_REFRESH_WORKERS = int(os.getenv("SCRAPE_REFRESH_WORKERS", 2))
+# Background refreshes allowed per source per minute (SCRAPE_REFRESH_BUDGET_<SOURCE> overrides)
+SCRAPE_REFRESH_BUDGET = int(os.getenv("SCRAPE_REFRESH_BUDGET", 10))
+
+
+# ----------------------------
+# Backends
+# ----------------------------
+class _BaseCache:
+    backend = None
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=_MISSING):
+        """Return the fresh value for ``key``, or ``default``."""
+        entry = self._lookup(key, time.time(), allow_stale=False)
+        return default if entry is None else entry[0]
+
+    def get_entry(self, key):
+        """Return ``(value, expires_at)`` for a fresh or still-servable stale entry, else None."""
+        return self._lookup(key, time.time(), allow_stale=True)
+
+    def peek(self, key, default=_MISSING):
+        """Like ``get``, but not counted in stats: for re-checking a key whose miss was already counted."""
+        entry = self._lookup(key, time.time(), allow_stale=False, count=False)
+        return default if entry is None else entry[0]
+
+    def expires_at(self, key):
+        """Return when ``key`` stops being fresh, or None if it is gone. Not counted in stats.
+
+        Backends override this with a read that skips loading the value.
+        """
+        entry = self._lookup(key, time.time(), allow_stale=True, count=False)
+        return None if entry is None else entry[1]
+
+    def stats(self):
+        return {
+            "backend": self.backend,
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class MemoryCache(_BaseCache):
+    """Thread-safe in-process cache with per-entry TTL and LRU eviction.
+
+    ``set(..., stale_ttl=n)`` keeps an entry for ``n`` seconds past its expiry
+    so ``get_entry`` can still serve it while it is being refreshed.
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_entries=512):
+        super().__init__(max_entries)
+        self._entries = OrderedDict()
+
+    def _lookup(self, key, now, allow_stale, count=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += count
+                return None
+            value, expires_at, stale_until = entry
+            if stale_until <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += count
+                return None
+            if expires_at <= now:
+                if not allow_stale:
+                    self.misses += count
+                    return None
+                self.stale_hits += count
+            else:
+                self.hits += count
+            self._entries.move_to_end(key)
+            return value, expires_at
+
+    def expires_at(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[2] <= time.time():
+            return None
+        return entry[1]
+
+    def set(self, key, value, ttl, stale_ttl=0):
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at, expires_at + stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(_BaseCache):
+    """On-disk cache that survives restarts. Values must be JSON serializable.
+
+    Recency is tracked with an ``accessed_at`` column so the oldest entries are
+    evicted once ``max_entries`` is exceeded, mirroring ``MemoryCache``.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path, max_entries=5000):
+        super().__init__(max_entries)
+        self.path = path
+        self._connect()
+        # A connection must not cross fork(); each worker of a pre-forking server opens its own
+        os.register_at_fork(after_in_child=self._connect)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL, stale_until REAL)"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(entries)")]
+        if "stale_until" not in columns:
+            # Databases created before stale entries existed
+            self._conn.execute("ALTER TABLE entries ADD COLUMN stale_until REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+
+    def _connect(self):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+
+    def _lookup(self, key, now, allow_stale, count=True):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, COALESCE(stale_until, expires_at) FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += count
+                return None
+            if row[2] <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expirations += 1
+                self.misses += count
+                return None
+            if row[1] <= now:
+                if not allow_stale:
+                    self.misses += count
+                    return None
+                self.stale_hits += count
+            else:
+                self.hits += count
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0]), row[1]
+
+    def expires_at(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, COALESCE(stale_until, expires_at) FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return row[0]
+
+    def set(self, key, value, ttl, stale_ttl=0):
+        now = time.time()
+        payload = records.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at, stale_until)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now + ttl, now, now + ttl + stale_ttl),
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.evictions += max(cursor.rowcount, 0)
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self):
+        stats = super().stats()
+        stats["path"] = self.path
+        return stats
+
+
+def make_cache(name, default_max_entries=512):
+    """Build a cache from ``<NAME>_CACHE_BACKEND`` / ``_MAX_ENTRIES`` / ``_PATH`` env vars."""
+    prefix = f"{name.upper()}_CACHE"
+    backend = os.getenv(f"{prefix}_BACKEND", "memory").lower()
+    max_entries = int(os.getenv(f"{prefix}_MAX_ENTRIES", default_max_entries))
+    if backend == "sqlite":
+        path = os.getenv(f"{prefix}_PATH", f"{name.lower()}_cache.sqlite3")
+        return SQLiteCache(path, max_entries)
+    return MemoryCache(max_entries)
+
+
+# ----------------------------
+# Scrape result cache
+# ----------------------------
+scrape_cache = make_cache("scrape")
+scrape_flight = singleflight.group("scrape")
+
+
+def ttl_for(source):
+    return float(os.getenv(f"SCRAPE_CACHE_TTL_{source.upper()}", DEFAULT_TTLS.get(source, DEFAULT_TTL)))
+
+
+def stale_ttl_for(source):
+    if not SCRAPE_REFRESH:
+        return 0
+    return float(os.getenv(f"SCRAPE_CACHE_STALE_{source.upper()}", ttl_for(source)))
+
+
+def refresh_budget(source):
+    return int(os.getenv(f"SCRAPE_REFRESH_BUDGET_{source.upper()}", SCRAPE_REFRESH_BUDGET))
+
+
+scrape_refresher = refresher.Refresher(
+    scrape_cache.expires_at,
+    refresh_budget,
+    top_n=SCRAPE_REFRESH_TOP_N,
+    interval=SCRAPE_REFRESH_INTERVAL,
+    lead=SCRAPE_REFRESH_LEAD,
+    workers=SCRAPE_REFRESH_WORKERS,
+)
+
+
+def normalize_query(query):
+    return " ".join(str(query or "").lower().split())
+
+
+def scrape_key(source, query, location=None, limit=None):
+    return "|".join([source, normalize_query(query), normalize_query(location), str(limit)])
+
+
+def store(source, key, result):
+    """Cache and index a fresh scrape result; empty results are passed through untouched."""
+    if result:
+        scrape_cache.set(key, result, ttl_for(source), stale_ttl_for(source))
+        search_index.ingest(source, result)
+    return result
+
+
+def lookup(source, key, reload):
+    """Return the cached result for ``key``, or None.
+
+    Counts the lookup towards the key's popularity; ``reload()`` must fetch
+    and ``store`` the value again and is what background refreshes call. An
+    entry past its TTL but inside its stale window is returned as-is and a
+    refresh is scheduled.
+    """
+    if SCRAPE_REFRESH:
+        scrape_refresher.track(source, key, reload)
+    entry = scrape_cache.get_entry(key)
+    if entry is None:
+        return None
+    result, expires_at = entry
+    if expires_at <= time.time():
+        scrape_refresher.refresh(source, key)
+    return result
+
+
+def cached_scrape(source):
+    """Cache a scraper's non-empty results keyed on (source, query, location, limit).
+
+    The wrapped scraper must take ``query`` and may take ``location`` and
+    ``limit``; defaults are applied so ``f("x")`` and ``f("x", limit=10)`` share
+    an entry. Empty results and exceptions are never cached. Concurrent misses
+    for the same key share a single upstream call. Expired entries inside their
+    stale window are returned immediately while ``scrape_refresher`` reloads
+    them in the background.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = bound.arguments
+            key = scrape_key(source, params.get("query"), params.get("location"), params.get("limit"))
+
+            def fetch():
+                return store(source, key, func(*args, **kwargs))
+
+            result = lookup(source, key, lambda: scrape_flight.do(key, fetch))
+            if result is not None:
+                return result
+
+            def load():
+                # Re-check: a leader may have filled the entry just before we got here
+                result = scrape_cache.peek(key)
+                if result is not _MISSING:
+                    return result
+                return fetch()
+
+            return scrape_flight.do(key, load)
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+def stats():
+    stats = scrape_cache.stats()
+    stats["refresh"] = scrape_refresher.stats()
+    return stats
@@ -0,0 +1,248 @@
+"""Split long documents into prompt-sized chunks for the map/reduce summarizer.
+
+Chunks are measured in estimated model tokens instead of characters, and are
+packed from whole blocks: paragraphs, headings and page text, falling back to
+sentences and then words only for blocks larger than the budget. PDF page
+headers/footers repeated across pages and stray whitespace are removed first.
+"""
+import math
+import os
+import re
+
+from pdf_text import PAGE_BREAK
+
+# Estimated tokens per chunk sent to the model, and tokens of trailing context
+# repeated at the start of the next chunk (0 disables overlap).
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", 4000))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", 100))
+
+# Local token estimate, roughly what SentencePiece/BPE vocabularies do to
+# English: a short word is one token, longer words split every few characters
+# and punctuation is its own token. It errs high, so chunks stay under budget
+# without a count_tokens round trip per block.
+_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_HEADING_RE = re.compile(
+    r"^(#{1,6}\s+\S"
+    r"|(?i:chapter|section|part|appendix)\s+(\d+|[IVX]+|[A-Z])\b"
+    r"|\d+(\.\d+)*[.)]?\s+[A-Z]"
+    r"|([IVX]+|[A-Z])[.)]\s+[A-Z])"
+)
+_PAGE_NUMBER_RE = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+_SPACES_RE = re.compile(r"[ \t\u00a0\u200b]+")
+
+# Lines at the top or bottom of a page that may be a running header/footer
+_EDGE_LINES = 2
+
+
+def estimate_tokens(text):
+    return len(_TOKEN_RE.findall(text))
+
+
+def fits(text, max_tokens=None):
+    """True when ``text`` fits in one chunk of ``max_tokens`` (CHUNK_MAX_TOKENS)."""
+    max_tokens = max_tokens or CHUNK_MAX_TOKENS
+    # Every token is at least one character, so short texts need no counting
+    return len(text) <= max_tokens or estimate_tokens(text) <= max_tokens
+
+
+def _is_heading(line):
+    if len(line) > 80 or line.endswith((".", ",", ";")):
+        return False
+    if _HEADING_RE.match(line):
+        return True
+    letters = [c for c in line if c.isalpha()]
+    return len(letters) >= 3 and all(c.isupper() for c in letters)
+
+
+def _edge_key(line):
+    return re.sub(r"\d+", "#", line.lower())
+
+
+def _strip_repeated_lines(pages):
+    """Drop page numbers and lines repeated at the top/bottom of most pages."""
+    def edges(lines):
+        return set(range(min(_EDGE_LINES, len(lines)))) | set(range(max(0, len(lines) - _EDGE_LINES), len(lines)))
+
+    counts = {}
+    for lines in pages:
+        for key in {_edge_key(lines[i]) for i in edges(lines)}:
+            counts[key] = counts.get(key, 0) + 1
+    min_pages = max(3, math.ceil(len(pages) / 2))
+    repeated = {key for key, count in counts.items() if count >= min_pages} if len(pages) >= 3 else set()
+
+    stripped = []
+    for lines in pages:
+        drop = {i for i in edges(lines)
+                if _edge_key(lines[i]) in repeated or _PAGE_NUMBER_RE.match(lines[i])}
+        stripped.append([line for i, line in enumerate(lines) if i not in drop])
+    return stripped
+
+
+def clean(text):
+    """Normalize whitespace and, for PDF text (pages separated by PAGE_BREAK),
+    remove running headers/footers and page numbers.
+
+    Pages are rejoined as paragraphs, except that a page ending mid-sentence
+    runs on into the next one.
+    """
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        lines = [_SPACES_RE.sub(" ", line).strip() for line in page.splitlines()]
+        # Keep one blank line between paragraphs, none at the page edges
+        kept = [line for i, line in enumerate(lines) if line or (i and lines[i - 1])]
+        while kept and not kept[-1]:
+            kept.pop()
+        if kept:
+            pages.append(kept)
+    if len(pages) > 1:
+        pages = _strip_repeated_lines(pages)
+
+    out = []
+    for lines in pages:
+        if not lines:
+            continue
+        if out:
+            runs_on = not out[-1].endswith((".", "!", "?", ":")) and not _is_heading(lines[0])
+            out.append("\n" if runs_on else "\n\n")
+        out.append("\n".join(lines))
+    return "".join(out)
+
+
+def _hard_split(text, max_tokens):
+    """Character slices of ``text`` within ``max_tokens``, for runs with no space
+    to split at (URLs, CJK, PDF text that lost its spaces)."""
+    step = max(max_tokens, len(text) * max_tokens // max(estimate_tokens(text), 1))
+    pieces, start = [], 0
+    while start < len(text):
+        end = min(len(text), start + step)
+        # Every token is at least one character, so max_tokens characters always fit
+        while end - start > max_tokens and estimate_tokens(text[start:end]) > max_tokens:
+            end = start + max(max_tokens, (end - start) * 3 // 4)
+        pieces.append(text[start:end])
+        start = end
+    return pieces
+
+
+def _split_oversized(text, max_tokens):
+    """Split a block larger than ``max_tokens`` at sentence ends, then at spaces,
+    then anywhere."""
+    pieces, current, size = [], [], 0
+    for sentence in _SENTENCE_END_RE.split(text):
+        tokens = estimate_tokens(sentence)
+        if tokens > max_tokens:
+            words = sentence.split(" ")
+            step = max(1, len(words) * max_tokens // tokens)
+            parts = [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+        else:
+            parts = [sentence]
+        for part in parts:
+            tokens = estimate_tokens(part)
+            if tokens > max_tokens:
+                if current:
+                    pieces.append(" ".join(current))
+                    current, size = [], 0
+                pieces.extend(_hard_split(part, max_tokens))
+                continue
+            if current and size + tokens > max_tokens:
+                pieces.append(" ".join(current))
+                current, size = [], 0
+            current.append(part)
+            size += tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _blocks(text, max_tokens):
+    """Yield ``(is_heading, text, tokens)`` for each paragraph and heading of ``text``."""
+    for paragraph in re.split(r"\n\s*\n", text):
+        if not paragraph.strip():
+            continue
+        body = []
+        for line in paragraph.split("\n"):
+            if _is_heading(line):
+                if body:
+                    yield from _paragraph("\n".join(body), max_tokens)
+                    body = []
+                yield True, line, estimate_tokens(line)
+            else:
+                body.append(line)
+        if body:
+            yield from _paragraph("\n".join(body), max_tokens)
+
+
+def _paragraph(text, max_tokens):
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        yield False, text, tokens
+        return
+    for piece in _split_oversized(text, max_tokens):
+        yield False, piece, estimate_tokens(piece)
+
+
+def _tail(text, max_tokens):
+    """The last whole sentences of ``text`` within ``max_tokens``."""
+    kept, size = [], 0
+    for sentence in reversed(_SENTENCE_END_RE.split(text)):
+        size += estimate_tokens(sentence)
+        if size > max_tokens:
+            break
+        kept.append(sentence)
+    return " ".join(reversed(kept))
+
+
+def chunk_text(text, max_tokens=None, overlap_tokens=None):
+    """Split ``text`` into chunks of at most ``max_tokens`` estimated tokens.
+
+    Blocks are packed greedily; a heading closes a chunk that is at least half
+    full so sections start fresh, and a chunk ends on a heading only when the
+    headings before it would not leave room for their section. Each
+    chunk after the first opens with up to ``overlap_tokens`` of the previous
+    chunk's closing sentences, unless it starts at a heading.
+    """
+    max_tokens = max_tokens or CHUNK_MAX_TOKENS
+    overlap_tokens = CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+    overlap_tokens = min(overlap_tokens, max_tokens // 4)
+
+    chunks, current, size = [], [], 0
+
+    def close():
+        # Carry trailing headings over to the chunk they introduce, unless together
+        # they would crowd it out: a run of headings (a table of contents) stays as body
+        run = 0
+        while run < len(current) and current[-1 - run][0]:
+            run += 1
+        carried = []
+        if 0 < run < len(current) and sum(t for _, _, t in current[-run:]) <= max_tokens // 2:
+            carried = current[-run:]
+            del current[-run:]
+        if current:
+            chunks.append("\n\n".join(block for _, block, _ in current))
+        if carried:
+            return carried
+        if overlap_tokens and current and not current[-1][0]:
+            overlap = _tail(current[-1][1], overlap_tokens)
+            if overlap:
+                return [(False, overlap, estimate_tokens(overlap))]
+        return []
+
+    for block in _blocks(clean(text), max_tokens - overlap_tokens):
+        is_heading, _, tokens = block
+        # Consecutive headings belong together; only the first of a run starts a section
+        starts_section = is_heading and bool(current) and not current[-1][0]
+        if current and (size + tokens > max_tokens or (starts_section and size >= max_tokens // 2)):
+            current[:] = close()
+            if is_heading and current and not current[0][0]:
+                current.clear()  # no overlap into a new section
+            size = sum(t for _, _, t in current)
+            if current and size + tokens > max_tokens:
+                # Carried headings and this block do not fit together; never exceed the budget
+                chunks.append("\n\n".join(block for _, block, _ in current))
+                current.clear()
+                size = 0
+        current.append(block)
+        size += tokens
+    if current:
+        chunks.append("\n\n".join(block for _, block, _ in current))
+    return chunks
@@ -1,52 +1,81 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 import json
+import os
 import random
+from functools import partial
+
+import dedup
+import fanout
+import http_client
+import metrics
+import singleflight
+from records import Course, field_getter
+from cache import cached_scrape
+from html_parser import make_soup
+
+# Overall budget for the parallel Coursera + Udemy search
+COURSE_SEARCH_DEADLINE = float(os.getenv("COURSE_SEARCH_DEADLINE", 15))
 
 # ----------------------------
 # Coursera Scraper
 # ----------------------------
-def scrape_coursera_courses(query, limit=5):
-    """Scrape courses from Coursera"""
+COURSERA_STRAINER = SoupStrainer("li", attrs={"data-testid": "search-result"})
+
+
+@metrics.timed_stage("html_parse")
+def parse_coursera_courses(html, limit=5):
+    """Extract ``Course`` records from a Coursera search results page."""
     courses = []
-    try:
-        search_url = f"https://www.coursera.org/search?query={query}"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(search_url, headers=headers, timeout=15)
-        soup = BeautifulSoup(resp.text, 'html.parser')
-
-        course_cards = soup.select('li[data-testid="search-result"]')
-        count = 0
-        for course in course_cards:
-            if count >= limit:
-                break
-
-            title_elem = course.select_one('[data-testid="search-result-title"]')
-            provider_elem = course.select_one('[data-testid="partner-name"]')
-            link_elem = course.select_one('a')
-
-            if title_elem and link_elem:
-                title = title_elem.get_text(strip=True)
-                if not title:
-                    continue
+    soup = make_soup(html, COURSERA_STRAINER)
+
+    course_cards = soup.select('li[data-testid="search-result"]')
+    seen = set()
+    count = 0
+    for course in course_cards:
+        if count >= limit:
+            break
+
+        title_elem = course.select_one('[data-testid="search-result-title"]')
+        provider_elem = course.select_one('[data-testid="partner-name"]')
+        link_elem = course.select_one('a')
+
+        if title_elem and link_elem:
+            title = title_elem.get_text(strip=True)
+            if not title:
+                continue
 
-                url = link_elem.get("href", "")
-                if not url.startswith("http"):
-                    url = f"https://www.coursera.org{url}"
+            url = link_elem.get("href", "")
+            if not url.startswith("http"):
+                url = f"https://www.coursera.org{url}"
 
-                # avoid duplicates
-                if any(c['title'] == title for c in courses):
-                    continue
+            # avoid duplicates
+            key = dedup.title_key(title)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            courses.append(Course(
+                title=title,
+                provider=provider_elem.get_text(strip=True) if provider_elem else "Coursera",
+                platform="Coursera",
+                url=url,
+            ))
+            count += 1
+
+    return courses
 
-                courses.append({
-                    "title": title,
-                    "provider": provider_elem.get_text(strip=True) if provider_elem else "Coursera",
-                    "platform": "Coursera",
-                    "url": url
-                })
-                count += 1
 
-        return courses
+def coursera_search_url(query):
+    return f"https://www.coursera.org/search?query={query}"
+
+
+@cached_scrape("coursera")
+def scrape_coursera_courses(query, limit=5):
+    """Scrape courses from Coursera"""
+    try:
+        search_url = coursera_search_url(query)
+        resp = http_client.fetch(search_url, timeout=15)
+        return parse_coursera_courses(resp.text, limit)
     except Exception as e:
         print(f"Error scraping Coursera: {str(e)}")
         return []
@@ -55,37 +84,53 @@ def scrape_coursera_courses(query, limit=5):
 # ----------------------------
 # Udemy Scraper
 # ----------------------------
+UDEMY_STRAINER = SoupStrainer("script", attrs={"type": "application/ld+json"})
+
+
+@metrics.timed_stage("html_parse")
+def parse_udemy_courses(html, limit=5):
+    """Extract ``Course`` records from the JSON-LD blocks of a Udemy search page."""
+    courses = []
+    soup = make_soup(html, UDEMY_STRAINER)
+
+    scripts = soup.find_all("script")
+    seen = set()
+    count = 0
+    for script in scripts:
+        if count >= limit:
+            break
+        try:
+            data = json.loads(script.string)
+            if isinstance(data, dict) and data.get("@type") == "Course":
+                title = data.get("name", "Untitled")
+                key = dedup.title_key(title)
+                if key in seen:
+                    continue
+                seen.add(key)
+                courses.append(Course(
+                    title=title,
+                    provider=data.get("provider", {}).get("name", "Udemy"),
+                    platform="Udemy",
+                    url=data.get("url", "https://www.udemy.com"),
+                ))
+                count += 1
+        except Exception:
+            continue
+
+    return courses
+
+
+def udemy_search_url(query):
+    return f"https://www.udemy.com/courses/search/?q={query}"
+
+
+@cached_scrape("udemy")
 def scrape_udemy_courses(query, limit=5):
     """Scrape courses from Udemy using JSON-LD"""
-    courses = []
     try:
-        search_url = f"https://www.udemy.com/courses/search/?q={query}"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(search_url, headers=headers, timeout=10)
-        soup = BeautifulSoup(resp.text, 'html.parser')
-
-        scripts = soup.find_all("script", {"type": "application/ld+json"})
-        count = 0
-        for script in scripts:
-            if count >= limit:
-                break
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, dict) and data.get("@type") == "Course":
-                    title = data.get("name", "Untitled")
-                    if any(c['title'] == title for c in courses):
-                        continue
-                    courses.append({
-                        "title": title,
-                        "provider": data.get("provider", {}).get("name", "Udemy"),
-                        "platform": "Udemy",
-                        "url": data.get("url", "https://www.udemy.com")
-                    })
-                    count += 1
-            except Exception:
-                continue
-
-        return courses
+        search_url = udemy_search_url(query)
+        resp = http_client.fetch(search_url, timeout=10)
+        return parse_udemy_courses(resp.text, limit)
     except Exception as e:
         print(f"Error scraping Udemy: {str(e)}")
         return []
@@ -94,25 +139,26 @@ def scrape_udemy_courses(query, limit=5):
 # ----------------------------
 # Platform Suggestions Fallback
 # ----------------------------
+@singleflight.coalesce("courses")
 def get_course_suggestions(query, limit=5):
     """Get course suggestions: real courses first, fallback to platform links"""
-    # Try real courses first
-    coursera_courses = scrape_coursera_courses(query, limit)
-    udemy_courses = scrape_udemy_courses(query, limit)
-    all_courses = coursera_courses + udemy_courses
-
-    # Deduplicate
-    unique_courses = []
-    seen_titles = set()
-    for c in all_courses:
-        if c['title'] not in seen_titles:
-            unique_courses.append(c)
-            seen_titles.add(c['title'])
-
+    # Try real courses first, querying every platform in parallel and merging as they finish
+    results = fanout.as_completed([
+        partial(scrape_coursera_courses, query, limit),
+        partial(scrape_udemy_courses, query, limit),
+    ], COURSE_SEARCH_DEADLINE)
+    return merge_courses(results, query, limit)
+
+
+def merge_courses(results, query, limit=5):
+    """Merge ``(platform index, courses)`` pairs into the ``limit`` most relevant
+    distinct courses; platform search links if none came back."""
+    unique_courses = dedup.merge("courses", results, limit, query)
     if unique_courses:
-        return unique_courses[:limit]
+        return unique_courses
 
     # Fallback links
+    metrics.fallbacks.inc("course_platform_links")
     platforms = [
         {"name": "Coursera", "url": f"https://www.coursera.org/search?query={query}", "logo": "https://d3njjcbhbojbot.cloudfront.net/web/images/favicons/favicon-v2-96x96.png"},
         {"name": "Udemy", "url": f"https://www.udemy.com/courses/search/?q={query}", "logo": "https://www.udemy.com/staticx/udemy/images/v7/logo-udemy.svg"},
@@ -123,13 +169,13 @@ def get_course_suggestions(query, limit=5):
     
     platform_courses = []
     for platform in platforms[:limit]:
-        platform_courses.append({
-            "title": f"Search {platform['name']} for {query}",
-            "provider": platform['name'],
-            "platform": platform['name'],
-            "url": platform['url'],
-            "logo": platform['logo']
-        })
+        platform_courses.append(Course(
+            title=f"Search {platform['name']} for {query}",
+            provider=platform['name'],
+            platform=platform['name'],
+            url=platform['url'],
+            logo=platform['logo'],
+        ))
     
     return platform_courses
 
@@ -162,32 +208,32 @@ def generate_mock_courses(query, limit=5):
     mock_courses = []
     for i in range(min(limit, 10)):
         platform = platforms[i % len(platforms)]
-        mock_courses.append({
-            "title": course_titles[i % len(course_titles)],
-            "provider": random.choice(instructors),
-            "platform": platform["name"],
-            "url": f"https://{platform['name'].lower().replace(' ', '')}.com/course/{query.lower().replace(' ', '-')}-{i+1}",
-            "logo": platform["logo"]
-        })
+        mock_courses.append(Course(
+            title=course_titles[i % len(course_titles)],
+            provider=random.choice(instructors),
+            platform=platform["name"],
+            url=f"https://{platform['name'].lower().replace(' ', '')}.com/course/{query.lower().replace(' ', '-')}-{i+1}",
+            logo=platform["logo"],
+        ))
     return mock_courses
 
 
 # ----------------------------
 # Markdown Formatter
 # ----------------------------
+_course_fields = field_getter(Course)
+
+
+@metrics.timed_stage("markdown")
 def formatCoursesToMarkdown(data):
     if not data:
         return "No courses found."
-    markdown = "## Course Recommendations\n\n"
-    for i, course in enumerate(data):
-        title = course.get('title', f'Course {i+1}')
-        provider = course.get('provider', '')
-        platform = course.get('platform', '')
-        url = course.get('url', '#')
-        markdown += f"### {i + 1}. {title}\n"
-        if provider:
-            markdown += f"**Instructor/Provider:** {provider}\n"
-        if platform:
-            markdown += f"**Platform:** {platform}\n"
-        markdown += f"**Link:** [View Course]({url})\n\n"
-    return markdown
+    # One string per course, joined once
+    parts = ["## Course Recommendations\n\n"]
+    for i, course in enumerate(data, 1):
+        title, provider, platform, url, _ = _course_fields(course)
+        provider = f"**Instructor/Provider:** {provider}\n" if provider else ""
+        platform = f"**Platform:** {platform}\n" if platform else ""
+        parts.append(f"### {i}. {title or f'Course {i}'}\n{provider}{platform}"
+                     f"**Link:** [View Course]({url or '#'})\n\n")
+    return "".join(parts)
@@ -0,0 +1,73 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+import requests
+
+# Absolute time.monotonic() by which the current request must answer, or None
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+# Below this many seconds a network call is not worth starting
+MIN_CALL_SECONDS = 0.05
+
+
+class DeadlineExceeded(requests.Timeout):
+    """The request's time budget ran out before this step could start."""
+
+
+@contextmanager
+def budget(seconds):
+    """Run the block with ``seconds`` to spend; nested budgets can only shrink it."""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(cap=None):
+    """Seconds left in the current budget, at most ``cap``; ``cap`` itself when there is no budget."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return cap
+    left = max(0.0, deadline - time.monotonic())
+    return left if cap is None else min(cap, left)
+
+
+def timeout(cap):
+    """Timeout for a call that would normally wait ``cap`` seconds.
+
+    Raises ``DeadlineExceeded`` when too little budget is left to be useful.
+    """
+    left = remaining(cap)
+    if left is not None and left < MIN_CALL_SECONDS:
+        raise DeadlineExceeded("request deadline reached")
+    return left
+
+
+def current():
+    """Absolute ``time.monotonic()`` deadline of the current budget, or None."""
+    return _deadline.get()
+
+
+def outlasts(other):
+    """Whether the current budget ends meaningfully later than the deadline ``other`` (None: unbounded)."""
+    mine = _deadline.get()
+    if other is None:
+        return False
+    return mine is None or mine - other > MIN_CALL_SECONDS
+
+
+def expired():
+    left = remaining()
+    return left is not None and left < MIN_CALL_SECONDS
+
+
+def bind(func):
+    """Wrap ``func`` to run in a copy of the caller's context, so worker threads see its budget."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(func, *args, **kwargs)
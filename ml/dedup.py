@@ -0,0 +1,213 @@
+"""Merge results from several sources: drop near-duplicates and rank by relevance.
+
+Two items are the same result when their canonical URLs match (scheme, ``www.``,
+tracking parameters, fragments and trailing slashes ignored, search engine
+redirects unwrapped) or when their titles do: the same words in any order and
+case, or titles whose character shingles overlap by at least
+DEDUP_TITLE_SIMILARITY where neither only adds words to the other. Similar titles are found with MinHash signatures bucketed
+by band, so each item is compared only with the few items sharing a bucket
+instead of with every item kept so far.
+
+``Merger`` takes each source's items as they arrive and does all of this in
+that single pass; only choosing the top ``limit`` at the end looks at them again.
+"""
+import heapq
+import os
+import re
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import metrics
+
+# Shingle overlap (Jaccard, 0-1) above which two titles count as the same result
+DEDUP_TITLE_SIMILARITY = float(os.getenv("DEDUP_TITLE_SIMILARITY", 0.9))
+# 0 keeps merged results in source order instead of ranking them by the query
+DEDUP_RANK = os.getenv("DEDUP_RANK", "1") == "1"
+
+# One-permutation MinHash: each shingle's hash picks one of 32 slots by its low
+# bits and competes for that slot's minimum, so a signature costs one pass over
+# the shingles. Slots form 8 bands of 4; titles at the similarity threshold
+# share a band with probability ~0.98, unrelated ones almost never, and every
+# shared band is checked exactly. Bands with no shingles are not indexed.
+_BANDS = 8
+_ROWS = 4
+_SLOT_BITS = 5
+_EMPTY = 1 << 30
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_NUMBER_RE = re.compile(r"^(\d+|[ivx]+)$")
+_STOPWORDS = frozenset("a an and at by for from in of on or the to with".split())
+_TRACKING_PARAMS = frozenset((
+    "ref", "refid", "trk", "trackingid", "position", "pagenum", "src", "source",
+    "fbclid", "gclid", "couponcode", "referralcode",
+))
+_REDIRECT_PARAMS = {"duckduckgo.com": "uddg", "google.com": "q"}
+
+duplicates = metrics.Counter(
+    "edupath_duplicates_dropped_total", "Merged results dropped as duplicates, by what matched.",
+    ("kind", "match"),
+)
+
+
+def tokens(text):
+    """Lowercase words of ``text`` without accents, punctuation or stopwords."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode().lower()
+    return [word for word in _WORD_RE.findall(text) if word not in _STOPWORDS]
+
+
+def title_key(title):
+    """Key equal for titles made of the same words, in any order or case."""
+    return " ".join(sorted(set(tokens(title))))
+
+
+def canonical_url(url):
+    """``host/path?query`` with scheme, ``www.``, fragment, tracking parameters
+    and trailing slash removed, or "" when ``url`` has no host."""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower().rsplit("@", 1)[-1]
+    host = host.removeprefix("www.").removeprefix("m.")
+    if not host:
+        return ""
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    for site, param in _REDIRECT_PARAMS.items():
+        if host == site or host.endswith("." + site):
+            target = dict(query).get(param)
+            if target and target.startswith("http"):
+                return canonical_url(target)
+    query = sorted((name, value) for name, value in query
+                   if name.lower() not in _TRACKING_PARAMS and not name.lower().startswith("utm_"))
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{urlencode(query)}" if query else f"{host}{path}"
+
+
+def _shingles(words):
+    text = " ".join(words)
+    return {text[i:i + 3] for i in range(len(text) - 2)} or {text}
+
+
+def _bands(shingles):
+    slots = [_EMPTY] * (_BANDS * _ROWS)
+    mask = len(slots) - 1
+    for shingle in shingles:
+        h = hash(shingle) & 0x3FFFFFFF
+        value = h >> _SLOT_BITS
+        if value < slots[h & mask]:
+            slots[h & mask] = value
+    bands = [tuple(slots[band * _ROWS:(band + 1) * _ROWS]) for band in range(_BANDS)]
+    return [(band, rows) for band, rows in enumerate(bands) if rows.count(_EMPTY) < _ROWS]
+
+
+def _numbers(words):
+    return {word for word in words if _NUMBER_RE.match(word)}
+
+
+class _Entry:
+    __slots__ = ("item", "rank", "words", "shingles", "numbers")
+
+    def __init__(self, item, rank, words, shingles, numbers):
+        self.item = item
+        self.rank = rank
+        self.words = words
+        self.shingles = shingles
+        self.numbers = numbers
+
+
+class Merger:
+    """Collects items from several sources, keeping one per duplicate group.
+
+    ``add(source, items)`` may be called in any order as sources finish:
+    ``source`` is the source's position in the caller's preference order, and
+    the final ranking depends only on it and the items, not on arrival order.
+    Items are ranked by how many query words their title (and, at half weight,
+    their ``description_field``) contain, then by their position in their
+    source's own results, then by source. Of two duplicates the better-ranked
+    one is kept. ``scope_field`` limits title matching to items with the same
+    value there, e.g. the same company for jobs.
+    """
+
+    def __init__(self, kind, query="", url_field="url", description_field="description", scope_field=None):
+        self.kind = kind
+        self.query = set(tokens(query)) if DEDUP_RANK else set()
+        self.url_field = url_field
+        self.description_field = description_field
+        self.scope_field = scope_field
+        self.entries = []
+        self.keys = {}  # canonical URL / exact title key -> entry index
+        self.buckets = {}  # MinHash band -> indexes of the entries in it
+
+    def _score(self, title_words, item):
+        if not self.query:
+            return 0.0
+        in_title = self.query.intersection(title_words)
+        in_description = self.query.intersection(tokens(item.get(self.description_field))) - in_title
+        return (len(in_title) + 0.5 * len(in_description)) / len(self.query)
+
+    def _similar(self, index, words, shingles, numbers):
+        entry = self.entries[index]
+        # "Part 1" and "Part 2" are different courses however similar the rest is
+        if numbers and entry.numbers and numbers != entry.numbers:
+            return False
+        # "Machine Learning A-Z" or "Software Engineer II" is a different listing
+        # from "Machine Learning" or "Software Engineer", not a variant spelling
+        if words < entry.words or words > entry.words:
+            return False
+        overlap = len(shingles & entry.shingles)
+        return overlap / (len(shingles) + len(entry.shingles) - overlap) >= DEDUP_TITLE_SIMILARITY
+
+    def add(self, source, items):
+        for position, item in enumerate(items or []):
+            title_words = tokens(item.get("title"))
+            scope = " ".join(tokens(item.get(self.scope_field))) if self.scope_field else ""
+            url = canonical_url(item.get(self.url_field))
+            exact = ("title", scope, " ".join(sorted(set(title_words))))
+            words = frozenset(title_words)
+            shingles = _shingles(title_words)
+            numbers = _numbers(title_words)
+            buckets = [("similar", scope, band) for band in _bands(shingles)] if title_words else []
+            rank = (-self._score(title_words, item), position, source) if DEDUP_RANK else (source, position)
+
+            match, index = None, None
+            if url and ("url", url) in self.keys:
+                match, index = "url", self.keys[("url", url)]
+            elif title_words and exact in self.keys:
+                match, index = "title", self.keys[exact]
+            else:
+                candidates = {candidate for bucket in buckets for candidate in self.buckets.get(bucket, ())}
+                for candidate in sorted(candidates):
+                    if self._similar(candidate, words, shingles, numbers):
+                        match, index = "similar", candidate
+                        break
+
+            if index is None:
+                index = len(self.entries)
+                self.entries.append(_Entry(item, rank, words, shingles, numbers))
+            else:
+                duplicates.inc(self.kind, match)
+                entry = self.entries[index]
+                if rank < entry.rank:
+                    entry.item, entry.rank = item, rank
+
+            # Both copies' URL and title now lead to the kept one
+            if url:
+                self.keys.setdefault(("url", url), index)
+            if title_words:
+                self.keys.setdefault(exact, index)
+            if match != "similar":
+                for bucket in buckets:
+                    self.buckets.setdefault(bucket, []).append(index)
+
+    def results(self, limit=None):
+        """The best ``limit`` items (all when ``limit`` is not a positive int), best first."""
+        if isinstance(limit, int) and limit > 0:
+            ranked = heapq.nsmallest(limit, self.entries, key=lambda entry: entry.rank)
+        else:
+            ranked = sorted(self.entries, key=lambda entry: entry.rank)
+        return [entry.item for entry in ranked]
+
+
+def merge(kind, results, limit=None, query="", **fields):
+    """Merge ``(source, items)`` pairs, e.g. from ``fanout.as_completed``, in one pass."""
+    merger = Merger(kind, query, **fields)
+    for source, items in results:
+        merger.add(source, items)
+    return merger.results(limit)
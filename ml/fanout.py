@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from concurrent.futures import as_completed as futures_completed
+
+import deadline
+
+# Shared pool for leaf scraper calls. Keep callers that themselves fan out
+# (endpoints, batch handlers) off this pool so they can't starve it.
+SCRAPE_MAX_WORKERS = int(os.getenv("SCRAPE_MAX_WORKERS", 16))
+_executor = ThreadPoolExecutor(max_workers=SCRAPE_MAX_WORKERS, thread_name_prefix="scrape")
+
+
+def gather(calls, timeout):
+    """Run zero-argument callables concurrently under one overall deadline.
+
+    Returns a list aligned with ``calls``: each slot holds that call's result,
+    or ``None`` if it raised or was still running when ``timeout`` seconds
+    elapsed. Stragglers are abandoned, not interrupted; their results are
+    simply dropped. The wait never outlasts the current request's deadline
+    budget, and each call runs inside the caller's context so it sees it too.
+    """
+    results = [None] * len(calls)
+    for index, result in as_completed(calls, timeout):
+        results[index] = result
+    return results
+
+
+def as_completed(calls, timeout):
+    """Like ``gather``, but yields ``(index, result)`` for each call as soon as it
+    succeeds, so the caller can work on early results while the rest run."""
+    timeout = deadline.remaining(timeout)
+    futures = {_executor.submit(deadline.bind(call)): index for index, call in enumerate(calls)}
+    try:
+        for future in futures_completed(futures, timeout=timeout):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error in {_name(calls[futures[future]])}: {str(e)}")
+                continue
+            yield futures[future], result
+    except TimeoutError:
+        for future, index in futures.items():
+            if not future.done():
+                future.cancel()
+                print(f"⏱️ {_name(calls[index])} missed the {timeout:.1f}s deadline, dropping it")
+
+
+def _name(call):
+    func = getattr(call, "func", call)
+    return getattr(func, "__name__", repr(func))
@@ -0,0 +1,26 @@
+import os
+
+from bs4 import BeautifulSoup
+
+
+def _default_parser():
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+# lxml is C-backed and several times faster than the pure-Python html.parser.
+# Set HTML_PARSER to force one (e.g. when comparing output between them).
+HTML_PARSER = os.getenv("HTML_PARSER") or _default_parser()
+
+
+def make_soup(markup, parse_only=None, parser=None):
+    """Parse ``markup`` with the fastest available parser.
+
+    Pass a ``SoupStrainer`` as ``parse_only`` to build only the matching
+    top-level elements (and everything inside them) instead of the whole
+    document; the rest of the page is tokenized but never turned into tags.
+    """
+    return BeautifulSoup(markup, parser or HTML_PARSER, parse_only=parse_only)
@@ -0,0 +1,233 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.exceptions import TimeoutError as Urllib3Timeout
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+import deadline
+import metrics
+import resilience
+
+# Number of per-host pools kept alive, and connections kept per host
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", 10))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 10))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", 0.5))
+
+# ----------------------------
+# User-Agent rotation
+# ----------------------------
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) Gecko/20100101 Firefox/122.0"
+]
+
+# ACCEPT_ENCODING advertises "br" (and "zstd") only when urllib3 can decode it
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1"
+}
+
+
+# ----------------------------
+# Connect-time instrumentation
+# ----------------------------
+_local = threading.local()
+
+
+class _TimedConnectMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _local.connect_time = getattr(_local, "connect_time", 0.0) + time.perf_counter() - start
+            _local.new_connections = getattr(_local, "new_connections", 0) + 1
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class _DeadlineRetry(Retry):
+    """Retry that stops, keeping the last response, when the request's deadline
+    budget can't cover the backoff plus another full attempt."""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        left = deadline.remaining()
+        if left is not None and left < retry.get_backoff_time() + getattr(_local, "attempt_timeout", 0.0):
+            raise MaxRetryError(_pool, url, error or ResponseError("request deadline reached"))
+        return retry
+
+
+def _build_session():
+    # Only 429/5xx responses are retried. A timeout or connection error already
+    # cost up to the full timeout, and repeating it would multiply that. Retry-After
+    # is ignored on purpose: a throttled site can ask for minutes, and callers
+    # would rather fall back than hang.
+    retry = _DeadlineRetry(
+        total=HTTP_RETRIES,
+        connect=0,
+        read=0,
+        other=0,
+        status=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = _TimedAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+session = _build_session()
+
+
+# ----------------------------
+# Per-host timings
+# ----------------------------
+_stats_lock = threading.Lock()
+_host_stats = {}
+
+
+def record(host, connect, ttfb, download, size, new_connections, error=False):
+    """Add one request's timings (seconds) to the per-host stats; also used by async_http."""
+    with _stats_lock:
+        stats = _host_stats.setdefault(host, {
+            "requests": 0, "errors": 0, "new_connections": 0, "bytes": 0,
+            "connect_s": 0.0, "ttfb_s": 0.0, "download_s": 0.0,
+        })
+        stats["requests"] += 1
+        stats["errors"] += int(error)
+        stats["new_connections"] += new_connections
+        stats["bytes"] += size
+        stats["connect_s"] += connect
+        stats["ttfb_s"] += ttfb
+        stats["download_s"] += download
+
+
+def host_stats():
+    """Per-host request counts and average connect/TTFB/download times in ms."""
+    with _stats_lock:
+        snapshot = {host: dict(stats) for host, stats in _host_stats.items()}
+    report = {}
+    for host, stats in snapshot.items():
+        count = stats["requests"] or 1
+        report[host] = {
+            "requests": stats["requests"],
+            "errors": stats["errors"],
+            "new_connections": stats["new_connections"],
+            "bytes": stats["bytes"],
+            "avg_connect_ms": round(stats["connect_s"] * 1000 / max(stats["new_connections"], 1), 2),
+            "avg_ttfb_ms": round(stats["ttfb_s"] * 1000 / count, 2),
+            "avg_download_ms": round(stats["download_s"] * 1000 / count, 2),
+        }
+    return report
+
+
+# ----------------------------
+# Fetch
+# ----------------------------
+def _timed_out(error):
+    """True for a timeout, including one urllib3 reports as exhausted retries
+    (requests turns those into a ``ConnectionError``)."""
+    if isinstance(error, requests.Timeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, Urllib3Timeout)
+
+
+@metrics.timed_stage("http_fetch")
+def fetch(url, timeout=15, headers=None, **kwargs):
+    """GET ``url`` over the shared keep-alive session with a rotated User-Agent.
+
+    Returns a ``requests.Response`` whose body is already downloaded and
+    decoded. Network errors propagate, as with ``requests.get``. Requests to a
+    host whose circuit breaker is open, or beyond its rate limit, fail at once
+    with ``resilience.UpstreamUnavailable`` (a ``requests.RequestException``).
+    ``timeout`` is cut to what is left of the request's deadline budget, and
+    ``deadline.DeadlineExceeded`` is raised when nothing is left. A 429/5xx is
+    retried only if the budget still covers the backoff and a whole attempt;
+    otherwise that response is returned. Timeouts raise ``requests.Timeout``.
+    """
+    host = urlsplit(url).hostname or url
+    request_timeout = deadline.timeout(timeout)
+    guard = resilience.guard(host)
+    guard.acquire(min(resilience.HTTP_RATE_MAX_WAIT, request_timeout))
+    request_headers = {"User-Agent": random.choice(USER_AGENTS)}
+    if headers:
+        request_headers.update(headers)
+
+    _local.connect_time = 0.0
+    _local.new_connections = 0
+    _local.attempt_timeout = request_timeout
+    start = time.perf_counter()
+    try:
+        resp = session.get(url, headers=request_headers, timeout=request_timeout, stream=True, **kwargs)
+        headers_at = time.perf_counter()
+        content = resp.content
+    except Exception as e:
+        timed_out = _timed_out(e)
+        if timed_out and request_timeout < timeout:
+            # Our budget was short, not the host slow; don't count it against the breaker
+            guard.release()
+        else:
+            guard.record(ok=False)
+        record(host, _local.connect_time, time.perf_counter() - start, 0.0, 0, _local.new_connections, error=True)
+        if timed_out and not isinstance(e, requests.Timeout):
+            raise requests.Timeout(str(e), request=getattr(e, "request", None)) from e
+        raise
+    done = time.perf_counter()
+    guard.record(ok=resp.status_code != 429 and resp.status_code < 500)
+
+    # TTFB here is request start -> response headers, minus any TCP/TLS connect
+    record(
+        host,
+        _local.connect_time,
+        headers_at - start - _local.connect_time,
+        done - headers_at,
+        len(content),
+        _local.new_connections,
+        error=resp.status_code >= 400,
+    )
+    return resp
@@ -0,0 +1,79 @@
+import re
+from collections import Counter, defaultdict
+
+# Common English words plus filler that shows up in search queries and syllabi
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further get
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just like looking me more most my myself need no nor not now of off on once only or other our ours
+ourselves out over own please same she should so some such than that the their theirs them
+themselves then there these they this those through to too under until up very want was we were
+what when where which while who whom why will with would you your yours yourself yourselves
+able beginner beginners best career careers course courses final find good help job jobs know learn
+looking make new related role roles search show student students suggest switch teach tool tools
+use using want wants way ways well work year years
+""".split())
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+# Phrase boundaries; a period only ends a phrase at a sentence end, so "node.js" and "asp.net" stay whole
+_SPLIT_RE = re.compile(r"(?:[,;:!?()\[\]{}\"'\n\r\t|/\\]|\.(?:\s|$))+")
+
+
+def _candidate_phrases(text, max_words=3):
+    """Split text into runs of non-stopwords (RAKE candidates), at most ``max_words`` long."""
+    phrases = []
+    for fragment in _SPLIT_RE.split(text.lower()):
+        current = []
+        for word in _WORD_RE.findall(fragment):
+            if word in STOPWORDS or word.isdigit():
+                if current:
+                    phrases.append(tuple(current))
+                current = []
+                continue
+            current.append(word)
+            if len(current) == max_words:
+                phrases.append(tuple(current))
+                current = []
+        if current:
+            phrases.append(tuple(current))
+    return phrases
+
+
+def extract_keywords(text, max_keywords=3):
+    """Return up to ``max_keywords`` key phrases from ``text`` using RAKE scoring.
+
+    Each word scores degree / frequency (words that co-occur in longer phrases
+    rank higher), a phrase scores the sum of its words, and repeated phrases
+    count once per occurrence. Cheap enough to run on every request.
+    """
+    phrases = _candidate_phrases(text)
+    if not phrases:
+        return []
+
+    frequency = Counter()
+    degree = defaultdict(int)
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+
+    # Counter keeps first-seen order and sorted() is stable, so ties go to earlier phrases
+    phrase_counts = Counter(phrases)
+    scored = sorted(
+        phrase_counts,
+        key=lambda p: sum(degree[w] / frequency[w] for w in p) * phrase_counts[p],
+        reverse=True,
+    )
+
+    keywords = []
+    seen_words = set()
+    for phrase in scored:
+        # Skip phrases that only repeat words already chosen
+        if set(phrase) <= seen_words:
+            continue
+        keywords.append(" ".join(phrase))
+        seen_words.update(phrase)
+        if len(keywords) == max_keywords:
+            break
+    return keywords
@@ -1,230 +1,626 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, g, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import hashlib
+import json
 import os
+import queue
+import random
+import shutil
+import tempfile
+import time
+import threading
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, TimeoutError as FutureTimeoutError
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
-import PyPDF2
+
+# Load .env before the scraper modules so their caches pick up its settings
+load_dotenv()
 
 # Import scraper modules
+import cache
+import chunker
+import deadline
+import http_client
+import keywords
+import metrics
+import pdf_text
+import records
+import resilience
+import search_index
+import tasks
+import warmup
+import singleflight
 import job_scraper
 import courses_scraper
 import ai_tools_scraper 
 
-load_dotenv()
+class SpooledUploadRequest(Request):
+    """Keep uploads in memory, spilling to an anonymous temp file only past UPLOAD_SPOOL_BYTES."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+
+
+class RecordJSONProvider(DefaultJSONProvider):
+    """``jsonify`` through ``records.encode``: scraper records serialize directly, with orjson when installed.
+
+    ``sort_keys`` and the debug/``compact`` indenting are honored; ``ensure_ascii``
+    is not (orjson always writes UTF-8).
+    """
+
+    def dumps(self, obj, **kwargs):
+        return records.dumps(obj, kwargs.get("sort_keys", self.sort_keys), kwargs.get("indent"))
+
 
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
+app.json = RecordJSONProvider(app)
 CORS(app)
 
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def _observe_request(response):
+    started = g.get("request_started")
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.request_duration.observe(time.perf_counter() - started, endpoint, request.method,
+                                         str(response.status_code))
+    return response
+
 # Gemini API setup
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-2.0-flash')
+    model = genai.GenerativeModel(GEMINI_MODEL)
 else:
     model = None
     print("⚠️ GEMINI_API_KEY not found. Using fallback responses.")
 
-# File uploads
-UPLOAD_FOLDER = 'uploads'
+# At most GEMINI_MAX_CONCURRENCY model calls are in flight across all requests;
+# rate-limited calls are retried up to GEMINI_MAX_RETRIES times with backoff.
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 4))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 3))
+gemini_executor = ThreadPoolExecutor(max_workers=GEMINI_MAX_CONCURRENCY, thread_name_prefix="gemini")
+_RETRYABLE_GEMINI_ERRORS = (google_exceptions.ResourceExhausted, google_exceptions.ServiceUnavailable)
+_backoff_lock = threading.Lock()
+_backoff_until = 0.0
+
+# Model responses keyed on a hash of (model, action, prompt); see cache.make_cache
+# for the LLM_CACHE_BACKEND / _MAX_ENTRIES / _PATH settings.
+llm_cache = cache.make_cache("llm", default_max_entries=1024)
+llm_flight = singleflight.group("llm")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 24 * 3600))
+
+# Keyword extraction for search queries and documents: "auto" asks Gemini but
+# answers locally if it is slower than KEYWORD_LLM_TIMEOUT, "gemini" always
+# waits for the model, "local" never calls it.
+KEYWORD_EXTRACTOR = os.getenv("KEYWORD_EXTRACTOR", "auto").lower()
+KEYWORD_LLM_TIMEOUT = float(os.getenv("KEYWORD_LLM_TIMEOUT", 3))
+keyword_cache = cache.make_cache("keyword", default_max_entries=2048)
+KEYWORD_CACHE_TTL = float(os.getenv("KEYWORD_CACHE_TTL", 7 * 24 * 3600))
+
+# File uploads are processed from memory; requests over MAX_UPLOAD_MB are rejected
+# with 413 while the body is still being read.
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'doc', 'docx'}
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+MAX_UPLOAD_MB = float(os.getenv("MAX_UPLOAD_MB", 16))
+UPLOAD_SPOOL_BYTES = int(float(os.getenv("UPLOAD_SPOOL_MB", 4)) * 1024 * 1024)
+app.config['MAX_CONTENT_LENGTH'] = int(MAX_UPLOAD_MB * 1024 * 1024)
+
+# Time budget for the search endpoints, in seconds: API_DEADLINE_<ENDPOINT> by
+# default, or ?deadline=<seconds> per request (capped at API_DEADLINE_MAX).
+# Keyword extraction, scrapers and fallbacks share it and answer with
+# whatever they have when it runs out.
+API_DEADLINES = {
+    endpoint: float(os.getenv(f"API_DEADLINE_{endpoint.upper()}", 20))
+    for endpoint in ("jobs", "courses", "ai_tools", "batch")
+}
+API_DEADLINE_MAX = float(os.getenv("API_DEADLINE_MAX", 60))
+
+# Where the search endpoints get results unless ?source= says otherwise: "live"
+# scrapes, "index" answers from the local search index (scraping only when it
+# has nothing), "merged" does both and combines them.
+SEARCH_DEFAULT_SOURCE = os.getenv("SEARCH_DEFAULT_SOURCE", "live").lower()
+
+# /api/batch: lookups accepted per request, and threads running the distinct
+# lookups of all batches and speculative document searches (each still fans
+# out on the shared scrape pool).
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 50))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", 8))
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="batch")
+
+# Background processing for /api/tasks/*: submissions beyond TASK_QUEUE_SIZE pending
+# get a 503, and finished results are kept for TASK_RESULT_TTL seconds.
+task_manager = tasks.TaskManager(
+    workers=int(os.getenv("TASK_WORKERS", 2)),
+    max_pending=int(os.getenv("TASK_QUEUE_SIZE", 32)),
+    retention=float(os.getenv("TASK_RESULT_TTL", 600)),
+)
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 # ---------------- File/Text Processing ----------------
-def extract_text_from_pdf(filepath):
+# The processing helpers report failures as text starting with one of these
+# instead of raising; background tasks use them to tell failures apart.
+PDF_ERROR_PREFIX = "Error extracting text from PDF:"
+GEMINI_ERROR_PREFIX = "Error generating response:"
+NO_MODEL_MESSAGE = "Gemini API key not configured. Please set GEMINI_API_KEY in environment variables."
+
+def extract_text_from_pdf(source, max_pages=None, max_chars=None, progress=None):
+    """Extract text from a PDF given as a path or a binary file object.
+
+    ``max_pages``/``max_chars`` stop reading once enough text is available.
+    ``progress`` (see tasks.TaskManager) receives pages_parsed/pages_total.
+    """
     try:
-        with open(filepath, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+        if not hasattr(source, 'read'):
+            with open(source, 'rb') as file:
+                return extract_text_from_pdf(file, max_pages, max_chars, progress)
+        on_page = None
+        if progress is not None:
+            on_page = lambda done, total: progress(pages_parsed=done, pages_total=total)
+        return pdf_text.extract_text(source, max_pages, max_chars, on_page)
     except Exception as e:
-        return f"Error extracting text from PDF: {str(e)}"
+        return f"{PDF_ERROR_PREFIX} {str(e)}"
+
+def _llm_cache_key(action, prompt):
+    return hashlib.sha256(f"{GEMINI_MODEL}\0{action}\0{prompt}".encode("utf-8")).hexdigest()
+
+def _generate_text(prompt, action="chat"):
+    """Call the model, backing off and retrying when Gemini rate-limits us.
+
+    Non-empty responses are cached per (model, action, prompt), and identical
+    prompts already in flight share one call. The backoff is shared: once one
+    call is throttled, every worker waits it out instead of piling more
+    requests onto the quota.
+    """
+    key = _llm_cache_key(action, prompt)
+    cached = llm_cache.get(key, None)
+    if cached is not None:
+        return cached
+    return llm_flight.do(key, _call_model, prompt, key)
+
+def _wait_out_backoff():
+    delay = _backoff_until - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+def _throttled(error, attempt):
+    """Record a rate-limited attempt in the shared backoff; re-raises once retries are used up."""
+    global _backoff_until
+    if attempt == GEMINI_MAX_RETRIES:
+        raise error
+    print(f"Gemini throttled ({error.__class__.__name__}), retry {attempt + 1}/{GEMINI_MAX_RETRIES}")
+    with _backoff_lock:
+        _backoff_until = max(_backoff_until, time.time() + 2 ** attempt + random.random())
+
+def _call_model(prompt, key):
+    # Re-check without counting: _generate_text already counted this miss
+    cached = llm_cache.peek(key, None)
+    if cached is not None:
+        return cached
+
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        _wait_out_backoff()
+        try:
+            with metrics.stage_duration.time("gemini_call"):
+                text = model.generate_content(prompt).text or ""
+            if text:
+                llm_cache.set(key, text, LLM_CACHE_TTL)
+            return text
+        except _RETRYABLE_GEMINI_ERRORS as e:
+            _throttled(e, attempt)
+
+def _iter_generate_all(prompts, action="chat", stage="parts"):
+    """Run prompts concurrently on the shared Gemini pool.
+
+    A generator: yields ``(stage, done, total)`` as each call finishes and
+    returns the responses in input order (use with ``yield from``).
+    """
+    futures = [gemini_executor.submit(_generate_text, prompt, action) for prompt in prompts]
+    for done, _ in enumerate(as_completed(futures), 1):
+        yield stage, done, len(futures)
+    return [future.result() for future in futures]
+
+def _run_to_completion(generator):
+    """Exhaust a progress generator and return its return value."""
+    while True:
+        try:
+            next(generator)
+        except StopIteration as finished:
+            return finished.value
+
+def _stream_text(prompt, action="chat"):
+    """Yield the model's answer piece by piece as Gemini streams it, using the same cache.
+
+    The stream is read on the shared Gemini pool, so it counts against
+    GEMINI_MAX_CONCURRENCY and honors the shared backoff like any other call.
+    """
+    key = _llm_cache_key(action, prompt)
+    cached = llm_cache.get(key, None)
+    if cached is not None:
+        yield cached
+        return
+
+    pieces = queue.Queue()
+    future = gemini_executor.submit(_stream_model, prompt, pieces)
+    while True:
+        piece = pieces.get()
+        if piece is None:
+            break
+        yield piece
+    text = future.result()  # raises what the stream raised
+    if text:
+        llm_cache.set(key, text, LLM_CACHE_TTL)
+
+def _stream_model(prompt, pieces):
+    """Put each streamed piece on ``pieces``, then None; returns the full text.
 
-def generate_gemini_response(prompt, context=""):
+    Throttled streams are retried with the shared backoff until their first
+    piece arrives; after that an error ends the stream.
+    """
+    try:
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            _wait_out_backoff()
+            received = []
+            try:
+                with metrics.stage_duration.time("gemini_call"):
+                    for chunk in model.generate_content(prompt, stream=True):
+                        if chunk.text:
+                            received.append(chunk.text)
+                            pieces.put(chunk.text)
+                return "".join(received)
+            except _RETRYABLE_GEMINI_ERRORS as e:
+                if received:
+                    raise
+                _throttled(e, attempt)
+    finally:
+        pieces.put(None)
+
+def _group_for_reduce(summaries, max_tokens):
+    """Pack summaries into groups of at least two that fit ``max_tokens`` where possible."""
+    groups, current, size = [], [], 0
+    for summary in summaries:
+        tokens = chunker.estimate_tokens(summary)
+        if len(current) >= 2 and size + tokens > max_tokens:
+            groups.append(current)
+            current, size = [], 0
+        current.append(summary)
+        size += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+def generate_gemini_response(prompt, context="", action="chat", progress=None):
     if not model:
-        return "Gemini API key not configured. Please set GEMINI_API_KEY in environment variables."
+        return NO_MODEL_MESSAGE
     try:
         full_prompt = f"{context}\n\n{prompt}" if context else prompt
-        response = model.generate_content(full_prompt)
-        return response.text
+        if progress is not None:
+            progress(stage="generating")
+        return _generate_text(full_prompt, action)
     except Exception as e:
-        return f"Error generating response: {str(e)}"
+        return f"{GEMINI_ERROR_PREFIX} {str(e)}"
+
+def _reduce_chunks(text, max_chunk_tokens, action):
+    """Summarize ``text`` part by part and build the final combine prompt.
+
+    A generator: yields ``(stage, done, total)`` progress while the part and
+    merge summaries complete, and returns the combine prompt. Parts come from
+    ``chunker.chunk_text``. When the part summaries are too long to combine in
+    one prompt they are merged in groups, level by level, until they fit.
+    """
+    max_chunk_tokens = max_chunk_tokens or chunker.CHUNK_MAX_TOKENS
+    chunks = chunker.chunk_text(text, max_chunk_tokens)
+
+    instruction = (
+        "You will receive a large query in parts. For each part, write a brief,"
+        " information-dense summary in markdown. Keep each part's summary under 120 words."
+    )
+    partial_summaries = yield from _iter_generate_all([
+        f"{instruction}\n\nPart {idx+1}/{len(chunks)}:\n\n{chunk}"
+        for idx, chunk in enumerate(chunks)
+    ], action, "parts")
+
+    # Tree reduction: merge neighbouring summaries until they fit one prompt
+    merge_instruction = (
+        "Merge the following consecutive part-summaries of one document into a single,"
+        " information-dense summary in markdown. Keep their order and stay under 200 words."
+    )
+    while len(partial_summaries) > 1 and not chunker.fits("\n\n".join(partial_summaries), max_chunk_tokens):
+        groups = _group_for_reduce(partial_summaries, max_chunk_tokens)
+        merged = yield from _iter_generate_all([
+            f"{merge_instruction}\n\n" + "\n\n".join(group)
+            for group in groups if len(group) > 1
+        ], action, "merge")
+        merged_iter = iter(merged)
+        partial_summaries = [next(merged_iter) if len(group) > 1 else group[0] for group in groups]
 
-def generate_gemini_response_chunked(prompt, max_chunk_chars=4000, context=""):
+    final_instruction = (
+        "Combine the following part-summaries into a single concise answer."
+        " Use clear sections and bullet points where helpful. Keep total under 400 words."
+    )
+    return f"{final_instruction}\n\nPart summaries:\n\n" + "\n\n".join(partial_summaries)
+
+def generate_gemini_response_chunked(prompt, max_chunk_tokens=None, context="", action="chat", progress=None):
     """Generate a response for long prompts by chunking input text.
 
-    Splits the prompt into reasonably sized chunks to avoid model/context limits
-    and returns a concise aggregated summary.
+    Splits the prompt into chunks of up to ``max_chunk_tokens`` (CHUNK_MAX_TOKENS),
+    summarizes the chunks concurrently, and returns a concise aggregated summary.
+    ``progress`` (see tasks.TaskManager) receives stage/chunks_done/chunks_total.
     """
     if not model:
-        return "Gemini API key not configured. Please set GEMINI_API_KEY in environment variables."
+        return NO_MODEL_MESSAGE
     try:
         text = f"{context}\n\n{prompt}" if context else prompt
-        chunks = []
-        start_index = 0
-        while start_index < len(text):
-            end_index = min(start_index + max_chunk_chars, len(text))
-            chunks.append(text[start_index:end_index])
-            start_index = end_index
-
-        partial_summaries = []
-        for idx, chunk in enumerate(chunks):
-            instruction = (
-                "You will receive a large query in parts. For each part, write a brief,"
-                " information-dense summary in markdown. Keep each part's summary under 120 words."
-            )
-            resp = model.generate_content(f"{instruction}\n\nPart {idx+1}/{len(chunks)}:\n\n{chunk}")
-            partial_summaries.append(resp.text or "")
-
-        final_instruction = (
-            "Combine the following part-summaries into a single concise answer."
-            " Use clear sections and bullet points where helpful. Keep total under 400 words."
-        )
-        resp_final = model.generate_content(
-            f"{final_instruction}\n\nPart summaries:\n\n" + "\n\n".join(partial_summaries)
-        )
-        return resp_final.text
+        reducer = _reduce_chunks(text, max_chunk_tokens, action)
+        if progress is None:
+            final_prompt = _run_to_completion(reducer)
+        else:
+            while True:
+                try:
+                    stage, done, total = next(reducer)
+                except StopIteration as finished:
+                    final_prompt = finished.value
+                    break
+                progress(stage=stage, chunks_done=done, chunks_total=total)
+            progress(stage="combining")
+        return _generate_text(final_prompt, action)
     except Exception as e:
-        return f"Error generating response: {str(e)}"
+        return f"{GEMINI_ERROR_PREFIX} {str(e)}"
 
-def extract_topics_from_query(query, action_type):
-    """Extract relevant topics from a big query using Gemini for better scraping results."""
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def stream_gemini_response(prompt, action="chat", max_chunk_tokens=None):
+    """Yield Server-Sent Events for ``prompt``.
+
+    Long prompts first report ``progress`` events while their parts are
+    summarized; the answer then arrives as ``token`` events in the order the
+    model produces them, followed by one ``done`` event with the full text.
+    """
     if not model:
-        return query  # Fallback to original query if no Gemini
-    
+        yield _sse("error", {"error": NO_MODEL_MESSAGE})
+        return
     try:
-        # Create specific prompts based on action type
-        if action_type == "jobs":
-            prompt = f"""
-            Extract 2-3 key job-related keywords from this query for job search:
-            "{query}"
-            
-            Return only the keywords separated by commas, no explanations.
-            Focus on job titles, skills, technologies, or industries.
-            """
-        elif action_type == "courses":
-            prompt = f"""
-            Extract 2-3 key learning-related keywords from this query for course search:
-            "{query}"
-            
-            Return only the keywords separated by commas, no explanations.
-            Focus on subjects, skills, technologies, or learning areas.
-            """
-        elif action_type == "ai-tools":
-            prompt = f"""
-            Extract 2-3 key AI tool-related keywords from this query for AI tools search:
-            "{query}"
-            
-            Return only the keywords separated by commas, no explanations.
-            Focus on AI applications, use cases, or tool types.
-            """
-        else:
-            prompt = f"""
-            Extract 2-3 key keywords from this query:
-            "{query}"
-            
-            Return only the keywords separated by commas, no explanations.
-            """
+        if not chunker.fits(prompt, max_chunk_tokens):
+            reducer = _reduce_chunks(prompt, max_chunk_tokens, action)
+            while True:
+                try:
+                    stage, done, total = next(reducer)
+                except StopIteration as finished:
+                    prompt = finished.value
+                    break
+                yield _sse("progress", {"stage": stage, "done": done, "total": total})
+
+        pieces = []
+        for piece in _stream_text(prompt, action):
+            pieces.append(piece)
+            yield _sse("token", {"text": piece})
+        yield _sse("done", {"response": "".join(pieces)})
+    except Exception as e:
+        yield _sse("error", {"error": f"{GEMINI_ERROR_PREFIX} {str(e)}"})
+
+def _wants_stream(data):
+    return (
+        bool(data.get('stream'))
+        or request.args.get('stream', '').lower() in ('1', 'true')
+        or 'text/event-stream' in request.headers.get('Accept', '')
+    )
+
+def _sse_response(events):
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _parse_keywords(response_text):
+    """Turn a comma-separated model answer into at most 3 space-joined keywords."""
+    extracted_keywords = (response_text or "").strip()
+    if extracted_keywords:
+        # Remove any extra text and get just the keywords
+        keywords_list = extracted_keywords.split(',')[:3]  # Take first 3 keywords
+        keywords_list = [kw.strip() for kw in keywords_list if kw.strip()]
+        if keywords_list:
+            return ' '.join(keywords_list)
+    return None
+
+def _remember_keywords(key, future):
+    try:
+        extracted = _parse_keywords(future.result())
+    except Exception:
+        return
+    if extracted:
+        keyword_cache.set(key, extracted, KEYWORD_CACHE_TTL)
+
+@metrics.timed_stage("keyword_extraction")
+def _extract_keywords(kind, text, action_type, prompt, fallback):
+    """Memoized keyword extraction shared by queries and documents.
+
+    Answers from the keyword cache first. Otherwise asks Gemini, but falls
+    back to the local RAKE extractor when there is no model, when
+    KEYWORD_EXTRACTOR=local, or when Gemini takes longer than
+    KEYWORD_LLM_TIMEOUT or the request's remaining deadline budget; a late
+    Gemini answer still lands in the cache.
+    """
+    key = f"{kind}|{action_type}|" + hashlib.sha256(cache.normalize_query(text).encode("utf-8")).hexdigest()
+    cached = keyword_cache.get(key, None)
+    if cached is not None:
+        return cached
+
+    local = ' '.join(keywords.extract_keywords(text)) or fallback
+    if not model or KEYWORD_EXTRACTOR == "local":
+        keyword_cache.set(key, local, KEYWORD_CACHE_TTL)
+        return local
+
+    if deadline.expired():
+        return local
+
+    timeout = deadline.remaining(KEYWORD_LLM_TIMEOUT if KEYWORD_EXTRACTOR == "auto" else None)
+    future = gemini_executor.submit(_generate_text, prompt, f"keywords-{action_type}")
+    try:
+        extracted = _parse_keywords(future.result(timeout=timeout))
+    except FutureTimeoutError:
+        print(f"Keyword extraction took over {timeout:.1f}s, using local keywords for '{text[:50]}'")
+        future.add_done_callback(lambda f: _remember_keywords(key, f))
+        return local
+    except Exception as e:
+        print(f"Error extracting topics: {str(e)}")
+        return local
+
+    result = extracted or fallback
+    keyword_cache.set(key, result, KEYWORD_CACHE_TTL)
+    return result
+
+def extract_topics_from_query(query, action_type):
+    """Extract relevant topics from a big query using Gemini for better scraping results."""
+    # Create specific prompts based on action type
+    if action_type == "jobs":
+        prompt = f"""
+        Extract 2-3 key job-related keywords from this query for job search:
+        "{query}"
         
-        response = model.generate_content(prompt)
-        extracted_keywords = response.text.strip()
+        Return only the keywords separated by commas, no explanations.
+        Focus on job titles, skills, technologies, or industries.
+        """
+    elif action_type == "courses":
+        prompt = f"""
+        Extract 2-3 key learning-related keywords from this query for course search:
+        "{query}"
         
-        # Clean up the response and use it if valid
-        if extracted_keywords and len(extracted_keywords) > 0:
-            # Remove any extra text and get just the keywords
-            keywords = extracted_keywords.split(',')[:3]  # Take first 3 keywords
-            keywords = [kw.strip() for kw in keywords if kw.strip()]
-            if keywords:
-                return ' '.join(keywords)
+        Return only the keywords separated by commas, no explanations.
+        Focus on subjects, skills, technologies, or learning areas.
+        """
+    elif action_type == "ai-tools":
+        prompt = f"""
+        Extract 2-3 key AI tool-related keywords from this query for AI tools search:
+        "{query}"
         
-        return query  # Fallback to original query
-    except Exception as e:
-        print(f"Error extracting topics: {str(e)}")
-        return query  # Fallback to original query
+        Return only the keywords separated by commas, no explanations.
+        Focus on AI applications, use cases, or tool types.
+        """
+    else:
+        prompt = f"""
+        Extract 2-3 key keywords from this query:
+        "{query}"
+        
+        Return only the keywords separated by commas, no explanations.
+        """
+
+    return _extract_keywords("query", query, action_type, prompt, fallback=query)
 
 def extract_topics_from_document(file_text, action_type):
     """Extract relevant topics from uploaded document content."""
-    if not model:
-        return "document analysis"  # Fallback if no Gemini
+    # Truncate text if too long
+    text_sample = file_text[:2000] if len(file_text) > 2000 else file_text
     
-    try:
-        # Truncate text if too long
-        text_sample = file_text[:2000] if len(file_text) > 2000 else file_text
+    if action_type == "jobs":
+        prompt = f"""
+        Analyze this document and extract 2-3 key job-related keywords:
+        "{text_sample}"
         
-        if action_type == "jobs":
-            prompt = f"""
-            Analyze this document and extract 2-3 key job-related keywords:
-            "{text_sample}"
-            
-            Return only the keywords separated by commas, no explanations.
-            Focus on job titles, skills, technologies, or industries mentioned.
-            """
-        elif action_type == "courses":
-            prompt = f"""
-            Analyze this document and extract 2-3 key learning-related keywords:
-            "{text_sample}"
-            
-            Return only the keywords separated by commas, no explanations.
-            Focus on subjects, skills, technologies, or learning areas mentioned.
-            """
-        elif action_type == "ai-tools":
-            prompt = f"""
-            Analyze this document and extract 2-3 key AI tool-related keywords:
-            "{text_sample}"
-            
-            Return only the keywords separated by commas, no explanations.
-            Focus on AI applications, use cases, or tool types mentioned.
-            """
-        else:
-            prompt = f"""
-            Analyze this document and extract 2-3 key keywords:
-            "{text_sample}"
-            
-            Return only the keywords separated by commas, no explanations.
-            """
+        Return only the keywords separated by commas, no explanations.
+        Focus on job titles, skills, technologies, or industries mentioned.
+        """
+    elif action_type == "courses":
+        prompt = f"""
+        Analyze this document and extract 2-3 key learning-related keywords:
+        "{text_sample}"
         
-        response = model.generate_content(prompt)
-        extracted_keywords = response.text.strip()
+        Return only the keywords separated by commas, no explanations.
+        Focus on subjects, skills, technologies, or learning areas mentioned.
+        """
+    elif action_type == "ai-tools":
+        prompt = f"""
+        Analyze this document and extract 2-3 key AI tool-related keywords:
+        "{text_sample}"
         
-        # Clean up the response
-        if extracted_keywords and len(extracted_keywords) > 0:
-            keywords = extracted_keywords.split(',')[:3]
-            keywords = [kw.strip() for kw in keywords if kw.strip()]
-            if keywords:
-                return ' '.join(keywords)
+        Return only the keywords separated by commas, no explanations.
+        Focus on AI applications, use cases, or tool types mentioned.
+        """
+    else:
+        prompt = f"""
+        Analyze this document and extract 2-3 key keywords:
+        "{text_sample}"
         
-        return "document analysis"  # Fallback
-    except Exception as e:
-        print(f"Error extracting topics from document: {str(e)}")
-        return "document analysis"  # Fallback
+        Return only the keywords separated by commas, no explanations.
+        """
+
+    return _extract_keywords("document", text_sample, action_type, prompt, fallback="document analysis")
+
+# ai-tools documents: when Gemini has not returned keywords after
+# AI_TOOLS_SPECULATIVE_DELAY seconds, start searching with the local keywords it
+# is likely to time out to, so the rest of its wait overlaps the scrape. Cached
+# keywords and quick answers never start that search; a model answering after
+# the delay but before KEYWORD_LLM_TIMEOUT wastes it.
+AI_TOOLS_SPECULATIVE_SEARCH = os.getenv("AI_TOOLS_SPECULATIVE_SEARCH", "1") == "1"
+AI_TOOLS_SPECULATIVE_DELAY = float(os.getenv("AI_TOOLS_SPECULATIVE_DELAY", KEYWORD_LLM_TIMEOUT / 2))
+
+def _ai_tools_for_document(file_text, limit=5):
+    """Topics of an ai-tools document and the tools found for them."""
+    speculative = None
+    if AI_TOOLS_SPECULATIVE_SEARCH and model and KEYWORD_EXTRACTOR == "auto":
+        # The same keywords _extract_keywords falls back to
+        local = ' '.join(keywords.extract_keywords(file_text[:2000])) or "document analysis"
+        extracted = threading.Event()
 
-def process_file_content(filename, action, filepath):
+        def speculate():
+            if extracted.wait(AI_TOOLS_SPECULATIVE_DELAY):
+                return None  # the real keywords arrived first
+            return ai_tools_scraper.search_ai_tools(local, limit)
+
+        speculative = batch_executor.submit(deadline.bind(speculate))
+
+    topics = extract_topics_from_document(file_text, 'ai-tools')
+    if speculative is not None:
+        extracted.set()
+        if topics == local:
+            tools = speculative.result()
+            if tools is not None:
+                return topics, tools
+    return topics, ai_tools_scraper.search_ai_tools(topics, limit)
+
+# Characters of document text each action actually reads; PDFs stop parsing past them.
+# 'summary' uses the whole document.
+ACTION_TEXT_LIMITS = {'roadmap': 500, 'jobs': 2000, 'courses': 2000, 'ai-tools': 2000}
+
+def process_file_content(filename, action, stream, progress=None):
+    """Process an upload from ``stream``, a binary file object positioned at its start."""
     file_ext = filename.rsplit('.', 1)[1].lower()
     if file_ext == 'pdf':
-        file_text = extract_text_from_pdf(filepath)
+        max_chars = None if action == 'summary' else ACTION_TEXT_LIMITS.get(action, 4000)
+        file_text = extract_text_from_pdf(stream, max_chars=max_chars, progress=progress)
+        if file_text.startswith(PDF_ERROR_PREFIX):
+            return file_text  # nothing to summarize or search for
+        file_text = chunker.clean(file_text)
     elif file_ext in ['txt', 'doc', 'docx']:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            file_text = f.read()
+        file_text = stream.read().decode('utf-8')
     else:
         file_text = f"Image file: {filename}"
 
     # Use chunked handling for large inputs
-    is_large = isinstance(file_text, str) and len(file_text) > 4000
+    is_large = isinstance(file_text, str) and not chunker.fits(file_text)
     responder = generate_gemini_response_chunked if is_large else generate_gemini_response
 
     if action == 'summary':
         prompt = f"Summarize this document in markdown:\n\n{file_text}..."
-        return responder(prompt)
+        return responder(prompt, action=action, progress=progress)
     elif action == 'roadmap':
         prompt = f"Create a learning roadmap in markdown:\n\n{file_text[:500]}..."
-        return responder(prompt)
-    elif action in ['jobs', 'courses', 'ai-tools']:
+        return responder(prompt, action=action, progress=progress)
+    elif action == 'ai-tools':
+        # A slow topic extraction overlaps the tool search (see _ai_tools_for_document)
+        extracted_topics, tools = _ai_tools_for_document(file_text)
+        markdown = ai_tools_scraper.formatAIToolsToMarkdown(tools) if tools else "No related AI tools found."
+        return f"## Document Analysis: {extracted_topics}\n\n### Related AI Tools Found:\n\n{markdown}"
+    elif action in ['jobs', 'courses']:
         # Extract topics from document for related searches
         extracted_topics = extract_topics_from_document(file_text, action)
         
@@ -238,27 +634,22 @@ def process_file_content(filename, action, filepath):
             courses = courses_scraper.get_course_suggestions(extracted_topics, 5)
             markdown = courses_scraper.formatCoursesToMarkdown(courses) if courses else "No related courses found."
             return f"## Document Analysis: {extracted_topics}\n\n### Related Courses Found:\n\n{markdown}"
-        
-        elif action == 'ai-tools':
-            tools = ai_tools_scraper.scrape_ai_tools_real_time(extracted_topics, 5)
-            markdown = ai_tools_scraper.formatAIToolsToMarkdown(tools) if tools else "No related AI tools found."
-            return f"## Document Analysis: {extracted_topics}\n\n### Related AI Tools Found:\n\n{markdown}"
     else:
-        return responder(f"Analyze this document: {file_text[:4000]}...")
-
-def process_text_content(text, action):
-    # Use chunked handling for large inputs
-    is_large = isinstance(text, str) and len(text) > 4000
-    responder = generate_gemini_response_chunked if is_large else generate_gemini_response
+        return responder(f"Analyze this document: {file_text[:4000]}...", action=action, progress=progress)
 
+def text_prompt(text, action):
     if action == 'summary':
-        prompt = f"Summarize this text in markdown:\n\n{text}"
-        return responder(prompt)
+        return f"Summarize this text in markdown:\n\n{text}"
     elif action == 'roadmap':
-        prompt = f"Create a detailed learning roadmap:\n\n{text}"
-        return responder(prompt)
+        return f"Create a detailed learning roadmap:\n\n{text}"
     else:
-        return responder(f"Analyze this text: {text}")
+        return f"Analyze this text: {text}"
+
+def process_text_content(text, action, progress=None):
+    # Use chunked handling for large inputs
+    is_large = isinstance(text, str) and not chunker.fits(text)
+    responder = generate_gemini_response_chunked if is_large else generate_gemini_response
+    return responder(text_prompt(text, action), action=action, progress=progress)
 
 @app.route('/api/process-file', methods=['POST'])
 def process_file():
@@ -271,14 +662,21 @@ def process_file():
             return jsonify({'error': 'No file selected'}), 400
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            result = process_file_content(filename, action, filepath)
-            os.remove(filepath)
+            result = process_file_content(filename, action, file.stream)
             return jsonify({'success': True, 'result': result, 'filename': filename, 'action': action})
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.errorhandler(RequestEntityTooLarge)
+def upload_too_large(e):
+    return jsonify({'error': f'File too large. Maximum upload size is {MAX_UPLOAD_MB:g} MB.'}), 413
+
+@app.errorhandler(deadline.DeadlineExceeded)
+def deadline_exceeded(e):
+    return jsonify({'error': f'Request deadline reached: {str(e)}'}), 504
+
 @app.route('/api/process-text', methods=['POST'])
 def process_text():
     try:
@@ -287,6 +685,8 @@ def process_text():
         action = data.get('action', 'summary')
         if not text:
             return jsonify({'error': 'No text provided'}), 400
+        if _wants_stream(data):
+            return _sse_response(stream_gemini_response(text_prompt(text, action), action))
         result = process_text_content(text, action)
         return jsonify({'success': True, 'result': result, 'action': action})
     except Exception as e:
@@ -299,17 +699,122 @@ def chat():
         message = data.get('message', '')
         if not message:
             return jsonify({'error': 'No message provided'}), 400
+        if _wants_stream(data):
+            return _sse_response(stream_gemini_response(message, 'chat'))
         # Use chunked handling for large inputs
-        is_large = isinstance(message, str) and len(message) > 4000
+        is_large = isinstance(message, str) and not chunker.fits(message)
         responder = generate_gemini_response_chunked if is_large else generate_gemini_response
-        response = responder(message)
+        response = responder(message, action='chat')
         return jsonify({'success': True, 'response': response})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# ---------------- Real-time AI Tools ----------------
+# ---------------- Background Tasks ----------------
+def _run_task(func, *args, progress=None):
+    """Run ``func`` as a task, failing it when it returns an error message instead of a result."""
+    result = func(*args, progress=progress)
+    if isinstance(result, str) and (result == NO_MODEL_MESSAGE or
+                                    result.startswith((PDF_ERROR_PREFIX, GEMINI_ERROR_PREFIX))):
+        raise RuntimeError(result)
+    return result
+
+def _process_upload_task(filename, action, buffer, progress=None):
+    try:
+        return process_file_content(filename, action, buffer, progress=progress)
+    finally:
+        buffer.close()
+
+def _submit_task(func, *args):
+    try:
+        task_id = task_manager.submit(_run_task, func, *args)
+    except tasks.TaskQueueFull:
+        response = jsonify({'error': 'Server is busy processing other documents. Please retry shortly.'})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    return jsonify({'success': True, 'task_id': task_id, 'status_url': f'/api/tasks/{task_id}'}), 202
 
+@app.route('/api/tasks/process-file', methods=['POST'])
+def submit_process_file():
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file provided'}), 400
+        file = request.files['file']
+        action = request.form.get('action', 'summary')
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'File type not allowed'}), 400
+        # The request's upload stream closes with the request, so give the task its own copy
+        buffer = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+        response = None
+        try:
+            shutil.copyfileobj(file.stream, buffer)
+            buffer.seek(0)
+            response = _submit_task(_process_upload_task, secure_filename(file.filename), action, buffer)
+        finally:
+            if response is None or response[1] != 202:
+                buffer.close()  # not queued, so no task will close it
+        return response
+    except RequestEntityTooLarge:
+        raise
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tasks/process-text', methods=['POST'])
+def submit_process_text():
+    data = request.get_json(silent=True) or {}
+    text = data.get('text', '')
+    action = data.get('action', 'summary')
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    return _submit_task(process_text_content, text, action)
+
+@app.route('/api/tasks/<task_id>', methods=['GET'])
+def get_task(task_id):
+    task = task_manager.get(task_id)
+    if task is None:
+        return jsonify({'error': 'Unknown or expired task'}), 404
+    return jsonify(task)
+
+# ---------------- Search Helpers ----------------
+def search_items(kind, query, limit, live, mode=None, location=None):
+    """Results for a search endpoint from ``mode``, else the source picked by ?source= (see SEARCH_DEFAULT_SOURCE)."""
+    mode = (mode or request.args.get('source', SEARCH_DEFAULT_SOURCE)).lower()
+    if mode == 'index':
+        indexed = search_index.search(kind, query, limit, location)
+        if indexed:
+            return indexed
+    results = live() or []
+    if mode == 'merged':
+        return search_index.merge(search_index.search(kind, query, limit, location), results, limit)
+    return results
+
+def budget_seconds(requested, endpoint):
+    """The budget for a request: ``requested`` (?deadline=) when it is a positive number,
+    else the endpoint's default; at most API_DEADLINE_MAX."""
+    try:
+        seconds = float(requested or 0)
+    except ValueError:
+        seconds = 0
+    # Zero, negative and NaN values would expire at once and answer with empty results
+    if not seconds > 0:
+        seconds = API_DEADLINES[endpoint]
+    return min(seconds, API_DEADLINE_MAX)
+
+def with_deadline(endpoint):
+    """Run the view under the endpoint's deadline budget (overridable with ?deadline=)."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with deadline.budget(budget_seconds(request.args.get('deadline'), endpoint)):
+                return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ---------------- Real-time AI Tools ----------------
 @app.route('/api/ai-tools', methods=['GET'])
+@with_deadline('ai_tools')
 def get_ai_tools():
     query = request.args.get('query', 'AI tools')
     limit = int(request.args.get('limit', 10))
@@ -321,7 +826,7 @@ def get_ai_tools():
         query = extracted_query
     
     # Real-time scrape only - no fallback to mock data
-    result = ai_tools_scraper.scrape_ai_tools_real_time(query, limit)
+    result = search_items('ai_tools', query, limit, lambda: ai_tools_scraper.scrape_ai_tools_real_time(query, limit))
     print(f"AI Tools: Found {len(result) if result else 0} real tools for '{query}'")
     
     # Format to markdown if requested
@@ -333,6 +838,7 @@ def get_ai_tools():
     return jsonify(result)
 
 @app.route('/api/jobs', methods=['GET'])
+@with_deadline('jobs')
 def get_jobs():
     query = request.args.get('query', 'Software Engineer')
     location = request.args.get('location', 'gujarat')
@@ -344,8 +850,9 @@ def get_jobs():
         print(f"Big query detected. Original: '{query}' -> Extracted: '{extracted_query}'")
         query = extracted_query
     
-    # Real-time LinkedIn jobs only (no mock fallback)
-    jobs = job_scraper.get_jobs(query, 'gujarat', limit)
+    # Real-time jobs from every board in JOB_SOURCES (or the index, see ?source=); no mock fallback
+    jobs = search_items('jobs', query, limit, lambda: job_scraper.get_jobs(query, location, limit),
+                        location=location)
     print(f"Jobs endpoint returned {len(jobs) if jobs else 0} items for '{query}' in '{location}'")
     
     result = {"jobs": jobs}
@@ -360,6 +867,7 @@ def get_jobs():
 
 
 @app.route('/api/courses', methods=['GET'])
+@with_deadline('courses')
 def get_courses():
     query = request.args.get('query', 'AI')
     limit = int(request.args.get('limit', 5))
@@ -371,7 +879,7 @@ def get_courses():
         query = extracted_query
     
     # Prefer real scraped courses; get_course_suggestions already tries real then platform links
-    courses = courses_scraper.get_course_suggestions(query, limit)
+    courses = search_items('courses', query, limit, lambda: courses_scraper.get_course_suggestions(query, limit))
     print(f"Courses endpoint returned {len(courses) if courses else 0} items for '{query}'")
     
     # Format to markdown if requested
@@ -382,10 +890,157 @@ def get_courses():
     
     return jsonify(courses)
 
+# ---------------- Batch Search ----------------
+_BATCH_DEFAULT_LIMITS = {'jobs': 10, 'courses': 5, 'ai-tools': 10}
+BATCH_GRACE_SECONDS = 0.25
+
+def _batch_items(payload):
+    """Validate the lookups of a /api/batch body as ``(type, query, location, limit)`` tuples."""
+    items = payload.get('requests')
+    if not isinstance(items, list) or not items:
+        raise ValueError("'requests' must be a non-empty list")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise ValueError(f"At most {BATCH_MAX_ITEMS} requests per batch")
+    parsed = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"requests[{index}] must be an object")
+        kind = str(item.get('type', '')).lower().replace('_', '-')
+        if kind not in _BATCH_DEFAULT_LIMITS:
+            raise ValueError(f"requests[{index}].type must be one of: {', '.join(_BATCH_DEFAULT_LIMITS)}")
+        query = item.get('query')
+        if not isinstance(query, str) or not query.strip():
+            raise ValueError(f"requests[{index}].query is required")
+        try:
+            limit = max(1, int(item.get('limit', _BATCH_DEFAULT_LIMITS[kind])))
+        except (TypeError, ValueError):
+            raise ValueError(f"requests[{index}].limit must be an integer")
+        location = str(item.get('location', 'gujarat')) if kind == 'jobs' else None
+        parsed.append((kind, query.strip(), location, limit))
+    return parsed
+
+def _batch_lookup(kind, query, location, limit, mode):
+    """One distinct batch lookup, run the same way as the matching GET endpoint."""
+    if len(query) > 50:
+        query = extract_topics_from_query(query, kind)
+    if kind == 'jobs':
+        return search_items('jobs', query, limit, lambda: job_scraper.get_jobs(query, location, limit), mode, location)
+    if kind == 'courses':
+        return search_items('courses', query, limit, lambda: courses_scraper.get_course_suggestions(query, limit), mode)
+    return search_items('ai_tools', query, limit, lambda: ai_tools_scraper.scrape_ai_tools_real_time(query, limit), mode)
+
+def _batch_result(kind, items, markdown):
+    if kind == 'jobs':
+        data = {"jobs": items}
+        rendered = job_scraper.formatJobsToMarkdown(data) if markdown else None
+    elif kind == 'courses':
+        data = items
+        rendered = courses_scraper.formatCoursesToMarkdown(items) if markdown else None
+    else:
+        data = items
+        rendered = ai_tools_scraper.formatAIToolsToMarkdown(items) if markdown else None
+    return {"markdown": rendered, "data": data} if markdown else {"data": data}
+
+@app.route('/api/batch', methods=['POST'])
+@with_deadline('batch')
+def batch_search():
+    """Run many jobs/courses/ai-tools lookups in one request.
+
+    Body: ``{"requests": [{"type", "query", "limit", "location"}], "format", "source"}``.
+    Lookups that differ only in case, spacing or limit run once, at the largest
+    limit asked for, and all distinct lookups run concurrently. Results come
+    back in request order; a lookup that fails or misses the deadline gets an
+    ``error`` instead of ``data``.
+    """
+    payload = request.get_json(silent=True) or {}
+    try:
+        items = _batch_items(payload)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    mode = str(payload.get('source') or SEARCH_DEFAULT_SOURCE)
+    markdown = payload.get('format') == 'markdown'
+
+    lookups = {}
+    for kind, query, location, limit in items:
+        key = (kind, " ".join(query.lower().split()), location)
+        if key not in lookups or lookups[key][2] < limit:
+            lookups[key] = (query, location, limit)
+    futures = {
+        key: batch_executor.submit(deadline.bind(_batch_lookup), key[0], query, location, limit, mode)
+        for key, (query, location, limit) in lookups.items()
+    }
+    # A little past the budget: lookups that run out of it still answer with what they gathered
+    left = deadline.remaining()
+    wait(futures.values(), timeout=None if left is None else left + BATCH_GRACE_SECONDS)
+
+    results = []
+    for kind, query, location, limit in items:
+        future = futures[(kind, " ".join(query.lower().split()), location)]
+        result = {"type": kind, "query": query, "limit": limit}
+        if location is not None:
+            result["location"] = location
+        if not future.done():
+            future.cancel()
+            result["error"] = "Deadline exceeded"
+        elif future.exception() is not None:
+            result["error"] = str(future.exception())
+        else:
+            result.update(_batch_result(kind, (future.result() or [])[:limit], markdown))
+        results.append(result)
+    print(f"Batch: {len(items)} lookups, {len(lookups)} distinct")
+    return jsonify({"results": results, "distinct_lookups": len(lookups)})
+
 # ---------------- Health Check ----------------
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy', 'gemini_configured': bool(GEMINI_API_KEY)})
+    return jsonify({
+        'status': 'healthy',
+        'gemini_configured': bool(GEMINI_API_KEY),
+        'scrape_cache': cache.stats(),
+        'llm_cache': llm_cache.stats(),
+        'keyword_cache': keyword_cache.stats(),
+        'search_index': search_index.stats(),
+        'tasks': task_manager.stats(),
+        'startup': warmup.report(),
+        'upstream_hosts': http_client.host_stats(),
+        'upstream_breakers': resilience.stats(),
+        'singleflight': singleflight.stats(),
+    })
+
+# ---------------- Metrics ----------------
+@metrics.collector
+def _app_metrics():
+    caches = {'scrape': cache.stats(), 'llm': llm_cache.stats(), 'keyword': keyword_cache.stats()}
+    for field, kind in (('hits', 'counter'), ('stale_hits', 'counter'), ('misses', 'counter'),
+                        ('evictions', 'counter'), ('size', 'gauge')):
+        name = f"edupath_cache_{field}_total" if kind == 'counter' else f"edupath_cache_{field}"
+        yield name, kind, f"Cache {field.replace('_', ' ')}.", [
+            ({'cache': label}, stats[field]) for label, stats in caches.items()]
+
+    hosts = http_client.host_stats()
+    yield "edupath_upstream_requests_total", "counter", "Upstream HTTP requests per host.", [
+        ({'host': host}, stats['requests']) for host, stats in hosts.items()]
+    yield "edupath_upstream_errors_total", "counter", "Failed upstream HTTP requests per host.", [
+        ({'host': host}, stats['errors']) for host, stats in hosts.items()]
+
+    breakers = resilience.stats()
+    yield "edupath_circuit_open", "gauge", "1 while the host's circuit breaker is open or half open.", [
+        ({'host': host}, int(stats['state'] != 'closed')) for host, stats in breakers.items()]
+    yield "edupath_circuit_rejected_total", "counter", "Requests failed fast by an open breaker.", [
+        ({'host': host}, stats['rejected']) for host, stats in breakers.items()]
+    yield "edupath_rate_limited_total", "counter", "Requests refused by the per-host rate limit.", [
+        ({'host': host}, stats['rate_limited']) for host, stats in breakers.items()]
+
+    flights = singleflight.stats()
+    yield "edupath_singleflight_coalesced_total", "counter", "Calls that joined an in-flight duplicate.", [
+        ({'group': name}, stats['coalesced']) for name, stats in flights.items()]
+
+    yield "edupath_tasks_pending", "gauge", "Background document tasks waiting for a worker.", [
+        ({}, task_manager.stats()['pending'])]
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 # ---------------- Run Server ----------------
 if __name__ == '__main__':
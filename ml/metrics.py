@@ -0,0 +1,167 @@
+"""Prometheus text-format metrics without a client library.
+
+Counters and histograms are updated in process (one dict lookup, a bisect and
+a lock per observation). Numbers the modules already keep - cache hit
+counts, per-host request stats, breaker state - are read by collectors only
+when /metrics is scraped. Each worker process reports its own values, with
+its ``pid`` as a label on every sample.
+"""
+import asyncio
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Seconds; spans cache hits (sub-ms) to slow scrapes and model calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40)
+
+_metrics = []
+_collectors = []
+
+
+def _labels(names, values):
+    # Preforked workers share a port; the pid tells their series apart
+    pairs = [f'pid="{os.getpid()}"']
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [(labels, list(values)) for labels, values in self._series.items()]
+        names = self.labelnames + ("le",)
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels(names, labels + (_number(bound),))} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(values[-1])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+def collector(func):
+    """Register ``func() -> iterable of (name, type, help, [(labels dict, value), ...])`` for /metrics."""
+    _collectors.append(func)
+    return func
+
+
+def render():
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for func in _collectors:
+        try:
+            families = list(func())
+        except Exception as e:
+            print(f"⚠️ Metrics collector {func.__name__} failed: {str(e)}")
+            continue
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------------
+# Application metrics
+# ----------------------------
+request_duration = Histogram(
+    "edupath_request_duration_seconds", "Time to produce a response, per endpoint.",
+    ("endpoint", "method", "status"),
+)
+stage_duration = Histogram(
+    "edupath_stage_duration_seconds",
+    "Time spent per pipeline stage (keyword_extraction, http_fetch, html_parse, gemini_call, markdown).",
+    ("stage",),
+)
+fallbacks = Counter(
+    "edupath_fallbacks_total", "Times a fallback path produced the answer.", ("fallback",),
+)
+
+
+def timed_stage(stage):
+    """Decorator recording each call's duration under ``stage`` in ``stage_duration``."""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    stage_duration.observe(time.perf_counter() - start, stage)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stage_duration.observe(time.perf_counter() - start, stage)
+        return wrapper
+    return decorator
@@ -0,0 +1,82 @@
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+
+# PDFs with at least this many pages are split into page ranges and extracted
+# on PDF_WORKERS processes; set PDF_WORKERS=1 to always extract in-process.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 40))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Ends every page of extracted text, so later stages can tell pages apart
+PAGE_BREAK = "\f"
+
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # Forking a threaded server copies its locks mid-use; workers come from a
+        # clean forkserver instead (spawn where that is unavailable, e.g. Windows)
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context(method))
+    return _pool
+
+
+def iter_page_texts(reader, max_pages=None, max_chars=None):
+    """Yield page texts in order, stopping after ``max_pages`` pages or once
+    ``max_chars`` characters have been produced."""
+    produced = 0
+    for index, page in enumerate(reader.pages):
+        if max_pages is not None and index >= max_pages:
+            return
+        text = page.extract_text() or ""
+        yield text
+        produced += len(text) + 1
+        if max_chars is not None and produced >= max_chars:
+            return
+
+
+def _extract_range(data, start, stop):
+    """Worker entry point: extract pages ``start:stop`` from raw PDF bytes."""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def _extract_parallel(data, page_count):
+    size = -(-page_count // PDF_WORKERS)
+    ranges = [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+    futures = [_get_pool().submit(_extract_range, data, start, stop) for start, stop in ranges]
+    for future in futures:
+        yield from future.result()
+
+
+def _report(pages, page_count, progress):
+    for done, text in enumerate(pages, 1):
+        progress(done, page_count)
+        yield text
+
+
+def extract_text(stream, max_pages=None, max_chars=None, progress=None):
+    """Return the text of the PDF in binary ``stream``, each page followed by a line break and PAGE_BREAK.
+
+    With ``max_pages``/``max_chars`` only the leading pages needed are parsed.
+    Large uncapped documents are extracted across a process pool.
+    ``progress(pages_done, page_count)`` is called as pages become available.
+    """
+    reader = PyPDF2.PdfReader(stream)
+    page_count = len(reader.pages)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+
+    if max_chars is None and PDF_WORKERS > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+        stream.seek(0)
+        pages = _extract_parallel(stream.read(), page_count)
+    else:
+        pages = iter_page_texts(reader, max_pages, max_chars)
+    if progress is not None:
+        pages = _report(pages, page_count, progress)
+    return "".join(f"{text}\n{PAGE_BREAK}" for text in pages)
@@ -0,0 +1,129 @@
+"""Result records shared by the scrapers, and the JSON encoding used for API responses.
+
+``Job``, ``Course`` and ``AITool`` are slotted dataclasses: no per-instance
+``__dict__``, so a cached result list takes a fraction of the memory of the
+equivalent dicts. They also answer ``item["title"]`` and ``item.get("logo")``,
+so code that reads results works the same on records, on dicts loaded back
+from the SQLite cache, and on search index hits.
+"""
+import json
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # falls back to the standard library encoder
+    orjson = None
+
+
+class Record:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True)
+class Job(Record):
+    title: str
+    company: str
+    location: str
+    description: str
+    link: str
+
+
+@dataclass(slots=True)
+class Course(Record):
+    title: str
+    provider: str
+    platform: str
+    url: str
+    logo: Optional[str] = None
+
+
+@dataclass(slots=True)
+class AITool(Record):
+    title: str
+    url: str
+    description: str
+
+
+def field_getter(cls):
+    """``get(item)`` returning the tuple of ``cls``'s fields, from a ``cls`` record
+    (one C-level call) or from an equivalent dict (missing keys give None)."""
+    names = cls.__slots__
+    by_attr = attrgetter(*names)
+
+    def get(item):
+        if type(item) is cls:
+            return by_attr(item)
+        return tuple(item.get(name) for name in names)
+    return get
+
+
+def _default(obj):
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _plain(obj):
+    # The C encoder's ``default`` hook is slow per call; turning records into
+    # dicts up front is cheaper for the list / {"jobs": [...]} shapes responses use
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    if type(obj) is list:
+        return [_plain(item) for item in obj]
+    if type(obj) is dict:
+        return {key: _plain(value) for key, value in obj.items()}
+    return obj
+
+
+_encoders = {}
+
+
+def _encoder(sort_keys, indent):
+    encoder = _encoders.get((sort_keys, indent))
+    if encoder is None:
+        encoder = _encoders[(sort_keys, indent)] = json.JSONEncoder(
+            sort_keys=sort_keys, indent=indent, separators=(",", ": ") if indent else (",", ":"),
+            default=_default,
+        )
+    return encoder
+
+
+def encode(obj, sort_keys=False, indent=None):
+    """JSON bytes for ``obj``, which may contain records.
+
+    orjson, when installed, serializes the slotted dataclasses natively in C;
+    otherwise records are converted to dicts and written by a reused stdlib
+    encoder (non-ASCII characters escaped). Either way an unset optional field
+    is written as ``null``. ``indent`` pretty-prints (orjson always uses 2).
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return _encoder(sort_keys, indent).encode(_plain(obj)).encode("utf-8")
+
+
+def dumps(obj, sort_keys=False, indent=None):
+    return encode(obj, sort_keys, indent).decode("utf-8")
+
+
+def truncate(text, length=150):
+    return text[:length] + "..." if len(text) > length else text
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Popularity scores are multiplied by this every pass so the top-N follows
+# what is being searched now; keys that fall below MIN_SCORE are forgotten.
+DECAY = 0.5
+MIN_SCORE = 0.25
+
+
+class Refresher:
+    """Keep popular cache entries warm in the background.
+
+    Callers report every lookup with ``track(source, key, load)``, where
+    ``load()`` fetches the value again and stores it. ``refresh(source, key)``
+    runs that load on a small worker pool - once at a time per key, and only
+    while the source is within ``budget_for(source)`` refreshes per minute.
+    A scheduler thread wakes every ``interval`` seconds and refreshes the
+    ``top_n`` most requested keys per source whose entry expires within
+    ``lead`` seconds (``expires_at(key)`` returns None for missing entries).
+
+    Threads start on the first ``track`` call, so the refresher can be created
+    before a pre-forking server forks.
+    """
+
+    def __init__(self, expires_at, budget_for, top_n=10, interval=30, lead=60, workers=2):
+        self.expires_at = expires_at
+        self.budget_for = budget_for
+        self.top_n = top_n
+        self.interval = interval
+        self.lead = lead
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._popular = defaultdict(dict)   # source -> key -> [score, load]
+        self._recent = defaultdict(deque)   # source -> start times of refreshes in the last minute
+        self._pending = set()
+        self._executor = None
+        self._thread = None
+        self.refreshes = defaultdict(int)
+        self.over_budget = defaultdict(int)
+        self.failures = defaultdict(int)
+
+    def track(self, source, key, load):
+        with self._lock:
+            if self._thread is None:
+                self._start()
+            entry = self._popular[source].get(key)
+            if entry is None:
+                self._popular[source][key] = [1.0, load]
+            else:
+                entry[0] += 1
+                entry[1] = load
+
+    def refresh(self, source, key):
+        """Schedule a background refresh; return False if skipped (already running or over budget)."""
+        now = time.time()
+        with self._lock:
+            if (source, key) in self._pending:
+                return False
+            entry = self._popular[source].get(key)
+            if entry is None:
+                return False
+            recent = self._recent[source]
+            while recent and recent[0] <= now - 60:
+                recent.popleft()
+            if len(recent) >= self.budget_for(source):
+                self.over_budget[source] += 1
+                return False
+            recent.append(now)
+            self._pending.add((source, key))
+            load = entry[1]
+        self._executor.submit(self._run, source, key, load)
+        return True
+
+    def _run(self, source, key, load):
+        try:
+            load()
+            self.refreshes[source] += 1
+        except Exception as e:
+            self.failures[source] += 1
+            print(f"Background refresh of {key} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard((source, key))
+
+    def _start(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="refresh")
+        self._thread = threading.Thread(target=self._loop, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            for source, key in self._due():
+                self.refresh(source, key)
+
+    def _due(self):
+        """Pick the top-N keys per source that are about to expire, then decay popularity."""
+        with self._lock:
+            candidates = []
+            for source, keys in self._popular.items():
+                ranked = sorted(keys.items(), key=lambda item: item[1][0], reverse=True)
+                candidates.extend((source, key) for key, _ in ranked[:self.top_n])
+                for key in [key for key, entry in keys.items() if entry[0] * DECAY < MIN_SCORE]:
+                    del keys[key]
+                for entry in keys.values():
+                    entry[0] *= DECAY
+
+        deadline = time.time() + self.lead
+        due = []
+        for source, key in candidates:
+            expires_at = self.expires_at(key)
+            if expires_at is not None and expires_at <= deadline:
+                due.append((source, key))
+        return due
+
+    def stats(self):
+        with self._lock:
+            sources = set(self._popular) | set(self.refreshes) | set(self.over_budget)
+            return {
+                source: {
+                    "tracked": len(self._popular.get(source, ())),
+                    "refreshes": self.refreshes[source],
+                    "over_budget": self.over_budget[source],
+                    "failures": self.failures[source],
+                    "budget_per_minute": self.budget_for(source),
+                }
+                for source in sorted(sources)
+            }
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+
+import requests
+
+# Requests per second allowed to each upstream host, with bursts up to
+# HTTP_RATE_BURST. A request that cannot get a token within
+# HTTP_RATE_MAX_WAIT seconds fails instead of queueing.
+HTTP_RATE_LIMIT = float(os.getenv("HTTP_RATE_LIMIT", 5))
+HTTP_RATE_BURST = float(os.getenv("HTTP_RATE_BURST", 10))
+HTTP_RATE_MAX_WAIT = float(os.getenv("HTTP_RATE_MAX_WAIT", 1))
+
+# Consecutive failures (errors, timeouts, 429/5xx) that open a host's breaker,
+# and how long it stays open before one trial request is let through.
+HTTP_BREAKER_FAILURES = int(os.getenv("HTTP_BREAKER_FAILURES", 5))
+HTTP_BREAKER_COOLDOWN = float(os.getenv("HTTP_BREAKER_COOLDOWN", 30))
+
+
+class UpstreamUnavailable(requests.RequestException):
+    """Raised instead of sending a request the host is not expected to answer."""
+
+
+class CircuitOpen(UpstreamUnavailable):
+    pass
+
+
+class RateLimited(UpstreamUnavailable):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait):
+        """Take a token; return how long to wait before using it, or None if that exceeds ``max_wait``."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            if wait > max_wait:
+                return None
+            # Reserve the token now so concurrent callers queue behind it
+            self._tokens -= 1
+        return wait
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failures`` consecutive failures -> half-open after ``cooldown``.
+
+    While half-open a single trial request is allowed; its outcome closes or
+    re-opens the breaker.
+    """
+
+    def __init__(self, failures, cooldown):
+        self.failure_threshold = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self.rejected = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self):
+        """Undo ``allow`` for a request that was never sent."""
+        with self._lock:
+            self._trial_running = False
+
+    def record(self, ok):
+        with self._lock:
+            self._trial_running = False
+            if ok:
+                self.state = "closed"
+                self.consecutive_failures = 0
+                return
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)), 1)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in_s": retry_in,
+            }
+
+
+class HostGuard:
+    """Rate limiter and circuit breaker for one upstream host."""
+
+    def __init__(self, host):
+        self.host = host
+        self.bucket = TokenBucket(HTTP_RATE_LIMIT, HTTP_RATE_BURST)
+        self.breaker = CircuitBreaker(HTTP_BREAKER_FAILURES, HTTP_BREAKER_COOLDOWN)
+        self.rate_limited = 0
+
+    def reserve(self, max_wait=HTTP_RATE_MAX_WAIT):
+        """Return the seconds to wait before sending a request to this host.
+
+        Raises ``UpstreamUnavailable`` if the breaker is open or no token is
+        available within ``max_wait``.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpen(f"{self.host} circuit open, skipping request")
+        wait = self.bucket.reserve(max_wait)
+        if wait is None:
+            self.rate_limited += 1
+            # Not the host's fault: give back a half-open trial without counting a failure
+            self.breaker.release()
+            raise RateLimited(f"{self.host} rate limit reached, skipping request")
+        return wait
+
+    def acquire(self, max_wait=HTTP_RATE_MAX_WAIT):
+        """Like ``reserve``, but sleeps out the wait."""
+        wait = self.reserve(max_wait)
+        if wait:
+            time.sleep(wait)
+
+    def record(self, ok):
+        self.breaker.record(ok)
+
+    def release(self):
+        """The request ended for reasons that say nothing about the host's health."""
+        self.breaker.release()
+
+    def stats(self):
+        stats = self.breaker.stats()
+        stats["rate_limited"] = self.rate_limited
+        return stats
+
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def guard(host):
+    with _guards_lock:
+        if host not in _guards:
+            _guards[host] = HostGuard(host)
+        return _guards[host]
+
+
+def stats():
+    with _guards_lock:
+        guards = list(_guards.values())
+    return {g.host: g.stats() for g in guards}
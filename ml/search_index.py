@@ -0,0 +1,266 @@
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+import dedup
+import records
+
+# 1 keeps every item a scraper returns in a local SQLite FTS5 index, one row per
+# (kind, canonical URL), so searches can be answered without going to the network.
+SEARCH_INDEX = os.getenv("SEARCH_INDEX", "0") == "1"
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "search_index.sqlite3")
+# Items not seen in a scrape for this many seconds are not returned, and are
+# deleted after SEARCH_INDEX_RETENTION seconds.
+SEARCH_INDEX_MAX_AGE = float(os.getenv("SEARCH_INDEX_MAX_AGE", 7 * 24 * 3600))
+SEARCH_INDEX_RETENTION = float(os.getenv("SEARCH_INDEX_RETENTION", 30 * 24 * 3600))
+# Scrape results waiting to be written by the background writer; beyond this
+# new results are dropped (they are still served and cached, just not indexed).
+SEARCH_INDEX_QUEUE = int(os.getenv("SEARCH_INDEX_QUEUE", 1000))
+
+# Scraper source -> kind of item it returns
+SOURCE_KINDS = {
+    "linkedin": "jobs",
+    "naukri": "jobs",
+    "coursera": "courses",
+    "udemy": "courses",
+    "aixploria": "ai_tools",
+    "duckduckgo": "ai_tools",
+}
+
+# Fields searched besides the title, per kind
+_BODY_FIELDS = {
+    "jobs": ("company", "location", "description"),
+    "courses": ("provider", "platform", "description"),
+    "ai_tools": ("description",),
+}
+
+_TOKEN_RE = re.compile(r"\w+")
+_PRUNE_EVERY = 200
+
+
+class SearchIndex:
+    """Deduplicated full-text index of scraped items.
+
+    ``ingest`` queues items for a background writer thread, which upserts
+    everything queued so far by canonical URL in one transaction, keeping when each item
+    was first and last seen. Scrapes therefore never wait on the index's lock
+    or on other processes' writes. ``search`` ranks matches with BM25 (title
+    weighted over the rest) and returns the stored items with those timestamps
+    added.
+
+    The writer starts on the first ``ingest`` call, so the index can be opened
+    before a pre-forking server forks.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connect()
+        # A connection must not cross fork(); each worker of a pre-forking server opens its own
+        os.register_at_fork(after_in_child=self._connect)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                body TEXT NOT NULL,
+                data TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                UNIQUE (kind, url)
+            );
+            CREATE INDEX IF NOT EXISTS items_last_seen ON items (last_seen);
+            CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+                title, body, content='items', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+                INSERT INTO items_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+                INSERT INTO items_fts (items_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+                INSERT INTO items_fts (items_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+                INSERT INTO items_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+            END;
+        """)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            self._canonicalize_urls()
+            self._conn.execute("PRAGMA user_version = 1")
+        self._conn.commit()
+        self._ingests = 0
+        self.ingested = 0
+        self.searches = 0
+        self.dropped = 0
+
+    def _canonicalize_urls(self):
+        """Rekey rows stored under raw URLs (before version 1) on their canonical URL,
+        keeping the most recently seen row of each group."""
+        kept = {}
+        rows = self._conn.execute("SELECT id, kind, url FROM items ORDER BY last_seen DESC").fetchall()
+        for row_id, kind, url in rows:
+            key = (kind, dedup.canonical_url(url))
+            if key in kept:
+                self._conn.execute("DELETE FROM items WHERE id = ?", (row_id,))
+            else:
+                kept[key] = row_id
+        for (kind, url), row_id in kept.items():
+            self._conn.execute("UPDATE items SET url = ? WHERE id = ? AND url != ?", (url, row_id, url))
+
+    def _connect(self):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # The writer thread does not survive fork(); the child starts its own
+        self._queue = queue.Queue(maxsize=SEARCH_INDEX_QUEUE)
+        self._writer = None
+
+    def ingest(self, source, items):
+        """Queue ``items`` for indexing; returns at once."""
+        if SOURCE_KINDS.get(source) is None or not items:
+            return
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="search-index", daemon=True)
+                    self._writer.start()
+        try:
+            self._queue.put_nowait((source, list(items), time.time()))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Wait until everything queued so far is written."""
+        self._queue.join()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # Whatever piled up while the last batch was written goes in one transaction
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not index {len(batch)} scrape results: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch):
+        rows = []
+        for source, items, seen_at in batch:
+            kind = SOURCE_KINDS[source]
+            for item in items:
+                # Tracking parameters (LinkedIn's refId/trackingId/position...) change on every scrape
+                url = dedup.canonical_url(item.get("url") or item.get("link"))
+                title = item.get("title")
+                if not url or not title:
+                    continue
+                body = " ".join(str(item.get(field) or "") for field in _BODY_FIELDS[kind])
+                rows.append((kind, url, source, title, body, records.dumps(item), seen_at, seen_at))
+        now = time.time()
+        with self._lock:
+            try:
+                self._upsert(rows, len(batch), now)
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+            self.ingested += len(rows)
+
+    def _upsert(self, rows, ingests, now):
+        self._conn.executemany(
+            "INSERT INTO items (kind, url, source, title, body, data, first_seen, last_seen)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (kind, url) DO UPDATE SET source = excluded.source, title = excluded.title,"
+            " body = excluded.body, data = excluded.data, last_seen = excluded.last_seen",
+            rows,
+        )
+        self._ingests += ingests
+        if self._ingests >= _PRUNE_EVERY:
+            self._ingests = 0
+            self._conn.execute("DELETE FROM items WHERE last_seen < ?", (now - SEARCH_INDEX_RETENTION,))
+        self._conn.commit()
+
+    def search(self, kind, query, limit=10, max_age=SEARCH_INDEX_MAX_AGE, location=None):
+        """Best matches for ``query``; with ``location``, items whose location contains it come first."""
+        tokens = _TOKEN_RE.findall(str(query or "").lower())
+        if not tokens:
+            return []
+        match = " OR ".join(f'"{token}"' for token in tokens)
+        location = str(location or "").strip().lower()
+        with self._lock:
+            self.searches += 1
+            rows = self._conn.execute(
+                "SELECT items.data, items.source, items.first_seen, items.last_seen"
+                " FROM items_fts JOIN items ON items.id = items_fts.rowid"
+                " WHERE items_fts MATCH ? AND items.kind = ? AND items.last_seen >= ?"
+                " ORDER BY instr(lower(json_extract(items.data, '$.location')), ?) > 0 DESC,"
+                " bm25(items_fts, 10.0, 1.0) LIMIT ?",
+                (match, kind, time.time() - max_age, location or None, limit),
+            ).fetchall()
+        results = []
+        for data, source, first_seen, last_seen in rows:
+            item = json.loads(data)
+            item["indexed_from"] = source
+            item["first_seen"] = _iso(first_seen)
+            item["last_seen"] = _iso(last_seen)
+            results.append(item)
+        return results
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT kind, COUNT(*) FROM items GROUP BY kind").fetchall())
+        return {"path": self.path, "items": counts, "ingested": self.ingested, "searches": self.searches,
+                "pending": self._queue.qsize(), "dropped": self.dropped}
+
+
+def _iso(timestamp):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+
+def _open():
+    if not SEARCH_INDEX:
+        return None
+    try:
+        return SearchIndex(SEARCH_INDEX_PATH)
+    except sqlite3.OperationalError as e:
+        # e.g. an SQLite build without FTS5
+        print(f"⚠️ Search index disabled: {str(e)}")
+        return None
+
+
+index = _open()
+
+
+def ingest(source, items):
+    if index is not None:
+        index.ingest(source, items)
+
+
+def search(kind, query, limit=10, location=None):
+    if index is None:
+        return []
+    return index.search(kind, query, limit, location=location)
+
+
+def merge(indexed, live, limit):
+    """Live results first, then indexed ones whose canonical URL was not among them."""
+    seen = {dedup.canonical_url(item.get("url") or item.get("link")) for item in live}
+    merged = list(live)
+    for item in indexed:
+        if dedup.canonical_url(item.get("url") or item.get("link")) not in seen:
+            merged.append(item)
+    return merged[:limit]
+
+
+def stats():
+    return index.stats() if index is not None else {"enabled": False}
@@ -0,0 +1,79 @@
+"""Production entry point: gunicorn with the app preloaded, then forked.
+
+    python serve.py                    # Flask app on threaded (gthread) workers
+    SERVER_MODE=asgi python serve.py   # asgi.app on uvicorn workers
+
+The master imports the app once (Gemini client setup, PyPDF2, bs4/lxml and
+every module-level table), so workers share that memory copy-on-write. Each
+worker then runs ``warmup.warm_up()`` before it accepts connections. Import,
+warm-up and total cold-start times are logged and reported under ``startup``
+on /health.
+"""
+import os
+import time
+
+STARTED = time.time()
+
+from gunicorn.app.base import BaseApplication  # noqa: E402
+
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi").lower()
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", 8000))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+WEB_THREADS = int(os.getenv("WEB_THREADS", 8))
+# Seconds a worker may stay silent before it is restarted; long PDF jobs and
+# SSE streams run on threads, so this only catches a wedged worker.
+WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", 120))
+
+
+def post_worker_init(worker):
+    import warmup
+
+    warmup.warm_up()
+    warmup.timings["cold_start_s"] = round(time.time() - STARTED, 3)
+    print(f"Worker {os.getpid()} ready: {warmup.timings}")
+
+
+class Server(BaseApplication):
+    def __init__(self, application, options):
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def main():
+    start = time.perf_counter()
+    import main as flask_main
+    import warmup
+
+    application = flask_main.app
+    worker_class = "gthread"
+    if SERVER_MODE == "asgi":
+        import asgi
+
+        application = asgi.app
+        worker_class = "uvicorn.workers.UvicornWorker"
+    warmup.timings["preload_s"] = round(time.perf_counter() - start, 3)
+    print(f"Preloaded app in {warmup.timings['preload_s']}s, starting {WEB_CONCURRENCY} {worker_class} workers")
+
+    Server(application, {
+        "bind": f"{HOST}:{PORT}",
+        "workers": WEB_CONCURRENCY,
+        "threads": WEB_THREADS,
+        "worker_class": worker_class,
+        "timeout": WEB_TIMEOUT,
+        "preload_app": True,
+        "post_worker_init": post_worker_init,
+        "accesslog": "-",
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
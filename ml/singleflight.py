@@ -0,0 +1,173 @@
+import asyncio
+import threading
+from functools import wraps
+
+import deadline
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "deadline", "truncated")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        # The leader's budget, which the shared run is held to
+        self.deadline = deadline.current()
+        self.truncated = False
+
+
+class Group:
+    """Collapse concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight wait and receive the same result or
+    exception. A waiter gives up with ``deadline.DeadlineExceeded`` when its
+    own request's deadline budget runs out first. The run is held to the
+    leader's budget; when that budget ran out during it, waiters with more
+    budget left run the call again instead of taking its truncated result.
+    Nothing is remembered once the call finishes - pair this with a cache for that.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            if not call.event.wait(deadline.remaining()):
+                raise deadline.DeadlineExceeded(f"request deadline reached waiting for in-flight {self.name} call")
+            if call.truncated and deadline.outlasts(call.deadline):
+                return self.do(key, func, *args, **kwargs)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            call.truncated = deadline.expired()
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self):
+        return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncGroup:
+    """``Group`` for coroutines: concurrent awaiters of one key share a single task.
+
+    Waiters are shielded from each other, so one caller giving up (on its
+    deadline budget, with ``deadline.DeadlineExceeded``, or by cancellation)
+    does not cancel the shared work. As with ``Group``, a run cut short by the
+    leader's budget is repeated for waiters that have budget left.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._tasks = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, func, *args, **kwargs):
+        entry = self._tasks.get(key)
+        if entry is None:
+            call = _Call()  # only its deadline and truncated fields are used
+            task = asyncio.ensure_future(self._run(call, func, *args, **kwargs))
+            entry = self._tasks[key] = (task, call)
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.executions += 1
+            leader = True
+        else:
+            self.coalesced += 1
+            leader = False
+        task, call = entry
+        # asyncio.wait neither raises the task's error nor cancels it on timeout
+        await asyncio.wait((task,), timeout=deadline.remaining())
+        if not task.done():
+            raise deadline.DeadlineExceeded(f"request deadline reached waiting for in-flight {self.name} call")
+        if not leader and call.truncated and deadline.outlasts(call.deadline):
+            return await self.do(key, func, *args, **kwargs)
+        return task.result()
+
+    async def _run(self, call, func, *args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            call.truncated = deadline.expired()
+
+    def stats(self):
+        return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._tasks)}
+
+
+def group(name, cls=Group):
+    """Return the process-wide group called ``name``, creating it on first use."""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = cls(name)
+        return _groups[name]
+
+
+def async_group(name):
+    return group(name, AsyncGroup)
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(item) for item in value)
+    return value
+
+
+def _call_key(args, kwargs):
+    return tuple(_normalize(a) for a in args), tuple(sorted((k, _normalize(v)) for k, v in kwargs.items()))
+
+
+def coalesce(name):
+    """Decorator: concurrent calls with the same (case/whitespace-normalized) args share one run.
+
+    Works on plain functions and on coroutine functions (via an ``AsyncGroup``).
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            async_flight = async_group(name)
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await async_flight.do(_call_key(args, kwargs), func, *args, **kwargs)
+            return async_wrapper
+
+        flight = group(name)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return flight.do(_call_key(args, kwargs), func, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def stats():
+    with _groups_lock:
+        return {name: flight.stats() for name, flight in _groups.items()}
@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+import uuid
+
+
+class TaskQueueFull(Exception):
+    """Raised by ``TaskManager.submit`` when the pending queue is at capacity."""
+
+
+class TaskManager:
+    """Bounded background queue for long-running document processing.
+
+    ``submit`` enqueues ``func(*args, progress=..., **kwargs)`` and returns a
+    task id immediately. ``func`` may call ``progress(**fields)`` to publish
+    progress (merged into the task's ``progress`` dict). Finished tasks are
+    kept for ``retention`` seconds, then forgotten.
+
+    Worker threads start on first submit, so the manager can be created
+    before a pre-forking server forks.
+    """
+
+    def __init__(self, workers=2, max_pending=32, retention=600):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(self, func, *args, **kwargs):
+        self._ensure_workers()
+        self._purge()
+        task_id = uuid.uuid4().hex
+        task = {
+            "task_id": task_id,
+            "status": "queued",
+            "progress": {},
+            "created_at": time.time(),
+            "finished_at": None,
+        }
+        with self._lock:
+            self._tasks[task_id] = task
+        try:
+            self._queue.put_nowait((task_id, func, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                del self._tasks[task_id]
+            raise TaskQueueFull(f"{self.max_pending} tasks already pending")
+        return task_id
+
+    def get(self, task_id):
+        """Return a snapshot of the task, or None if it is unknown or expired."""
+        self._purge()
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            snapshot = dict(task)
+            snapshot["progress"] = dict(task["progress"])
+        return snapshot
+
+    def stats(self):
+        with self._lock:
+            statuses = [task["status"] for task in self._tasks.values()]
+        return {
+            "workers": self.workers,
+            "pending": self._queue.qsize(),
+            "max_pending": self.max_pending,
+            "running": statuses.count("running"),
+            "retained": len(statuses),
+        }
+
+    def _ensure_workers(self):
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"task-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _purge(self):
+        cutoff = time.time() - self.retention
+        with self._lock:
+            expired = [task_id for task_id, task in self._tasks.items()
+                       if task["finished_at"] is not None and task["finished_at"] < cutoff]
+            for task_id in expired:
+                del self._tasks[task_id]
+
+    def _update(self, task_id, **fields):
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is not None:
+                task.update(fields)
+
+    def _work(self):
+        while True:
+            task_id, func, args, kwargs = self._queue.get()
+
+            def progress(**fields):
+                with self._lock:
+                    self._tasks[task_id]["progress"].update(fields)
+
+            self._update(task_id, status="running", started_at=time.time())
+            try:
+                result = func(*args, progress=progress, **kwargs)
+                self._update(task_id, status="succeeded", result=result, finished_at=time.time())
+            except Exception as e:
+                print(f"Task {task_id} failed: {str(e)}")
+                self._update(task_id, status="failed", error=str(e), finished_at=time.time())
+            finally:
+                self._queue.task_done()
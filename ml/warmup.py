@@ -0,0 +1,88 @@
+import os
+import time
+from functools import partial
+
+import ai_tools_scraper
+import cache
+import courses_scraper
+import fanout
+import http_client
+import job_scraper
+import keywords
+import search_index
+
+# Optional warm-up steps that touch the network, off by default: open a
+# keep-alive connection to every upstream host, and run these searches
+# (comma separated) through every endpoint's scrapers to fill the caches.
+WARMUP_CONNECT = os.getenv("WARMUP_CONNECT", "0") == "1"
+WARMUP_QUERIES = [q.strip() for q in os.getenv("WARMUP_QUERIES", "").split(",") if q.strip()]
+
+UPSTREAM_HOSTS = (
+    "www.linkedin.com",
+    "www.naukri.com",
+    "www.coursera.org",
+    "www.udemy.com",
+    "www.aixploria.com",
+    "duckduckgo.com",
+)
+
+# Filled in by the server entry point and by warm_up(); shown under "startup" on /health
+timings = {}
+
+
+def _parsers():
+    # First use compiles each scraper's CSS selectors and sets up the parser builder
+    empty = "<html><body></body></html>"
+    job_scraper.parse_linkedin_jobs(empty)
+    job_scraper.parse_naukri_jobs(empty)
+    courses_scraper.parse_coursera_courses(empty)
+    courses_scraper.parse_udemy_courses(empty)
+    ai_tools_scraper.parse_aixploria_tools(empty, 1)
+    ai_tools_scraper.parse_duckduckgo_tools(empty, 1)
+    keywords.extract_keywords("warm up the python data science keyword extractor")
+
+
+def _storage():
+    cache.stats()
+    search_index.stats()
+
+
+def _connections():
+    fanout.gather([partial(http_client.session.head, f"https://{host}/", timeout=3) for host in UPSTREAM_HOSTS], 5)
+
+
+def _queries():
+    # One after another: each search already fans out on the shared pool, and
+    # nesting them in fanout.gather could leave no worker free for their sources
+    for query in WARMUP_QUERIES:
+        job_scraper.get_jobs(query, "gujarat", 5)
+        courses_scraper.get_course_suggestions(query, 5)
+        ai_tools_scraper.scrape_ai_tools_real_time(query, 5)
+
+
+def warm_up():
+    """Prepare this process to serve: run each warm-up step and record its duration.
+
+    Call it in each worker after fork, before it accepts requests - connections
+    and threads must not be created in a pre-fork master.
+    """
+    steps = [("parsers", _parsers), ("storage", _storage)]
+    if WARMUP_CONNECT:
+        steps.append(("connections", _connections))
+    if WARMUP_QUERIES:
+        steps.append(("queries", _queries))
+
+    total = time.perf_counter()
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            print(f"⚠️ Warm-up step {name} failed: {str(e)}")
+        timings[f"warmup_{name}_s"] = round(time.perf_counter() - start, 3)
+    timings["warmup_s"] = round(time.perf_counter() - total, 3)
+    return timings
+
+
+def report():
+    return dict(timings, pid=os.getpid())